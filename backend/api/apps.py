@@ -1,6 +1,16 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
+
+    def ready(self):
+        from api.catalog import catalogs
+        from maze_solver.persistence.registry import layouts
+
+        layouts.table_dir = settings.STORE_TABLE_DIR
+        # Load the store layout, its graph and distance table once per worker
+        layouts.get(settings.STORE_LAYOUT)
+        catalogs.get(settings.STORE_CATALOG)
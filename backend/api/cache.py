@@ -0,0 +1,66 @@
+from django.core.cache import caches
+
+from maze_solver.graphs.solver import RoutePlan
+
+ROUTE_CACHE = 'routes'
+HITS_KEY = 'stats:hits'
+MISSES_KEY = 'stats:misses'
+
+
+def route_key(cart, collected_count):
+    return f'route:{cart}:{collected_count}'
+
+
+def plan_key(cart):
+    return f'plan:{cart}'
+
+
+def get_plan(cart):
+    """Return the plan every shopper with this cart follows, or None."""
+    data = caches[ROUTE_CACHE].get(plan_key(cart))
+    return None if data is None else RoutePlan.from_dict(data)
+
+
+def share_plan(route_plan):
+    """Cache route_plan for its cart unless another plan got there first,
+    and return whichever plan is cached.
+
+    Carts planned at the same time may come out in different orders, e.g.
+    when a deadline cuts the search short, so all adopt the first one.
+    """
+    caches[ROUTE_CACHE].add(plan_key(route_plan.cart), route_plan.to_dict())
+    return get_plan(route_plan.cart) or route_plan
+
+
+def get_route(key):
+    """Return the cached route response for key, counting hits and misses."""
+    cache = caches[ROUTE_CACHE]
+    value = cache.get(key)
+    count(cache, MISSES_KEY if value is None else HITS_KEY)
+    return value
+
+
+def set_route(key, value):
+    caches[ROUTE_CACHE].set(key, value)
+
+
+def route_cache_stats():
+    cache = caches[ROUTE_CACHE]
+    hits = cache.get(HITS_KEY, 0)
+    misses = cache.get(MISSES_KEY, 0)
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hitRate': hits / (hits + misses) if hits + misses else 0.0,
+    }
+
+
+def count(cache, key):
+    # add() is a no-op when the counter exists, incr() is atomic on shared
+    # backends such as memcached or redis
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        # Evicted between add() and incr()
+        cache.set(key, 1, timeout=None)
@@ -0,0 +1,118 @@
+import array
+import csv
+import hashlib
+import io
+import pathlib
+import threading
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping, NamedTuple
+
+
+class Product(NamedTuple):
+    pickup: int
+    shelf: int
+    zone: str
+
+
+class UnknownProduct(KeyError):
+    """Raised for product ids missing from the catalog."""
+
+    def __str__(self):
+        return f"Unknown product ids: {', '.join(self.args[0])}"
+
+
+@dataclass(frozen=True)
+class Catalog:
+    """Where each product is picked up and shelved in the store.
+
+    Columns are kept as read-only arrays next to an id-to-row mapping, so
+    each product costs a dict entry and a few bytes instead of an object.
+    """
+
+    path: pathlib.Path
+    mtime_ns: int
+    digest: bytes
+    rows: Mapping[str, int]
+    pickups: memoryview
+    shelves: memoryview
+    zone_ids: memoryview
+    zones: tuple[str, ...]
+
+    @classmethod
+    def load(cls, path, mtime_ns):
+        rows, zones = {}, {}
+        pickups, shelves, zone_ids = (
+            array.array('i'), array.array('i'), array.array('H')
+        )
+        content = pathlib.Path(path).read_bytes()
+        lines = io.StringIO(content.decode(), newline='')
+        for record in csv.DictReader(lines):
+            assert record['id'] not in rows, f"Duplicate id {record['id']}"
+            rows[record['id']] = len(rows)
+            pickups.append(int(record['pickup']))
+            shelves.append(int(record['shelf']))
+            zone_ids.append(zones.setdefault(record['zone'], len(zones)))
+        return cls(
+            path,
+            mtime_ns,
+            hashlib.sha256(content).digest(),
+            MappingProxyType(rows),
+            memoryview(pickups).toreadonly(),
+            memoryview(shelves).toreadonly(),
+            memoryview(zone_ids).toreadonly(),
+            tuple(zones),
+        )
+
+    @property
+    def version(self):
+        return self.digest.hex()[:16]
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __contains__(self, product_id):
+        return product_id in self.rows
+
+    def __getitem__(self, product_id):
+        try:
+            row = self.rows[product_id]
+        except KeyError:
+            raise UnknownProduct([product_id]) from None
+        return Product(
+            self.pickups[row], self.shelves[row], self.zones[self.zone_ids[row]]
+        )
+
+    def lookup(self, product_ids):
+        """Return the products in order, failing on any unknown id first."""
+        if unknown := [i for i in product_ids if i not in self.rows]:
+            raise UnknownProduct(unknown)
+        return [self[product_id] for product_id in product_ids]
+
+
+class CatalogIndex:
+    """Loads each catalog file once and reloads it when it changes on disk."""
+
+    def __init__(self):
+        self._catalogs: dict[pathlib.Path, Catalog] = {}
+        self._lock = threading.Lock()
+
+    def get(self, path):
+        path = pathlib.Path(path).resolve()
+        mtime_ns = path.stat().st_mtime_ns
+        catalog = self._catalogs.get(path)
+        if catalog is not None and catalog.mtime_ns == mtime_ns:
+            return catalog
+        with self._lock:
+            catalog = self._catalogs.get(path)
+            if catalog is None or catalog.mtime_ns != mtime_ns:
+                catalog = Catalog.load(path, mtime_ns)
+                self._catalogs[path] = catalog
+            return catalog
+
+    def clear(self):
+        with self._lock:
+            self._catalogs.clear()
+
+
+catalogs = CatalogIndex()
@@ -0,0 +1,43 @@
+def encode_route(route, current):
+    """Pack a route as unsigned LEB128 varints.
+
+    The body starts with the current square, followed by the route as
+    zigzag-encoded differences from the previous square (the first one from
+    zero). Steps between neighbouring squares fit in a single byte.
+    """
+    body = bytearray()
+    write_varint(body, current)
+    previous = 0
+    for index in route:
+        delta = index - previous
+        write_varint(body, delta << 1 if delta >= 0 else (-delta << 1) - 1)
+        previous = index
+    return bytes(body)
+
+
+def decode_route(body):
+    """Inverse of encode_route, returning (route, current)."""
+    values = iter_varints(body)
+    current = next(values)
+    route, previous = [], 0
+    for value in values:
+        previous += -(value + 1 >> 1) if value & 1 else value >> 1
+        route.append(previous)
+    return route, current
+
+
+def write_varint(body, value):
+    while value > 0x7F:
+        body.append(value & 0x7F | 0x80)
+        value >>= 7
+    body.append(value)
+
+
+def iter_varints(body):
+    value = shift = 0
+    for byte in body:
+        value |= (byte & 0x7F) << shift
+        shift += 7
+        if not byte & 0x80:
+            yield value
+            value = shift = 0
@@ -0,0 +1,57 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections
+
+
+class Overloaded(Exception):
+    """Raised when too many requests are already waiting for a solver."""
+
+
+class SolverPool:
+    """Runs blocking request handling off the event loop.
+
+    At most max_pending calls may be queued or running at once; more are
+    refused instead of queueing behind them. A call counts as pending
+    until its thread finishes, even after its caller has stopped waiting.
+    """
+
+    def __init__(self, workers, max_pending):
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix='solver'
+        )
+        self.max_pending = max_pending
+        self.pending = 0
+        self._lock = threading.Lock()
+
+    async def run(self, function, *args, timeout=None):
+        with self._lock:
+            if self.pending >= self.max_pending:
+                raise Overloaded
+            self.pending += 1
+        future = self.executor.submit(with_connections, function, *args)
+        future.add_done_callback(self._release)
+        # Cancelling a call that has not started yet frees its slot at once
+        return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+
+    def _release(self, future):
+        with self._lock:
+            self.pending -= 1
+
+
+def with_connections(function, *args):
+    # Django only recycles the connections of the request thread, so pool
+    # threads close theirs around every call, as a request would
+    close_old_connections()
+    try:
+        return function(*args)
+    finally:
+        close_old_connections()
+
+
+@functools.cache
+def solver_pool():
+    return SolverPool(settings.SOLVER_THREADS, settings.SOLVER_QUEUE_LIMIT)
@@ -1,3 +1,52 @@
-from django.test import TestCase
+import math
+import random
+from unittest import TestCase
 
-# Create your tests here.
+from maze_solver.graphs.tour import BruteForce, branch_and_bound, tour_cost
+
+
+class BranchAndBoundTests(TestCase):
+    def random_costs(self, rng, waypoints, unreachable):
+        size = waypoints + 2
+        return [
+            [
+                0 if u == v
+                else math.inf if rng.random() < unreachable
+                else rng.randint(1, 50)
+                for v in range(size)
+            ]
+            for u in range(size)
+        ]
+
+    def test_matches_brute_force(self):
+        rng = random.Random(0)
+        for case in range(400):
+            waypoints = rng.randint(0, 7)
+            unreachable = rng.choice([0, 0.2, 0.4])
+            costs = self.random_costs(rng, waypoints, unreachable)
+            with self.subTest(case=case, costs=costs):
+                expected = BruteForce().order(costs)
+                explored = branch_and_bound(costs)
+                self.assertGreaterEqual(explored.nodes, 1)
+                self.assertLessEqual(
+                    explored.nodes,
+                    sum(math.perm(waypoints, k) for k in range(waypoints + 1)),
+                )
+                if expected is None:
+                    self.assertIsNone(explored.order)
+                    continue
+                end = len(costs) - 1
+                self.assertEqual(
+                    explored.cost, tour_cost(costs, [0, *expected, end])
+                )
+                self.assertEqual(
+                    explored.cost, tour_cost(costs, [0, *explored.order, end])
+                )
+                self.assertCountEqual(explored.order, range(1, end))
+
+    def test_prunes_partial_tours(self):
+        rng = random.Random(1)
+        costs = self.random_costs(rng, 8, 0)
+        explored = branch_and_bound(costs)
+        # Every partial tour of 8 waypoints would be 109601 nodes
+        self.assertLess(explored.nodes, 109601 // 10)
@@ -3,4 +3,8 @@ from . import views
 
 urlpatterns = [
     path('generate-path/', views.generate_path, name='generate_path'),
+    path('generate-path-async/', views.generate_path_async, name='generate_path_async'),
+    path('generate-paths/', views.generate_paths, name='generate_paths'),
+    path('route-cache/', views.route_cache, name='route_cache'),
+    path('layout/', views.store_layout, name='store_layout'),
 ]
@@ -35,6 +35,9 @@ CORS_ALLOWED_ORIGINS = [
 
 CORS_ALLOW_CREDENTIALS = True
 
+# Metadata of the compact route responses travels in headers
+CORS_EXPOSE_HEADERS = ['X-Layout-Version', 'X-Collect-Item', 'X-Route-Optimal', 'X-Route-Gap']
+
 # Application definition
 
 INSTALLED_APPS = [
@@ -131,3 +134,39 @@ STATIC_URL = 'static/'
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Store layout served by the path finding API
+
+STORE_LAYOUT = BASE_DIR / 'mazes' / 'store.maze'
+STORE_CATALOG = BASE_DIR / 'mazes' / 'store_catalog.csv'
+# Where the layout's distance table is cached, None to keep it next to the
+# layout. When the directory is not writable each process builds its own.
+STORE_TABLE_DIR = None
+# Processes planning batches of carts in each web worker, None for one per
+# CPU. Every web worker starts its own pool, so keep this small.
+ROUTE_BATCH_WORKERS = 2
+# Threads serving generate-path-async/, how many requests may wait for or
+# hold one before new ones get a 503, and the seconds each may take
+SOLVER_THREADS = 4
+SOLVER_QUEUE_LIMIT = 32
+SOLVER_DEADLINE = 5.0
+# Milliseconds generate-path/ may spend ordering a cart's stops before it
+# settles for the best tour found so far, None to always solve exactly
+ROUTE_DEADLINE_MS = 200
+
+# Solved routes and their rendered SVG, keyed by layout, cart and progress.
+# Point the 'routes' alias at a shared backend to share it between workers.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'routes': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'routes',
+        'TIMEOUT': 60 * 60,
+        'OPTIONS': {
+            'MAX_ENTRIES': 2048,
+        },
+    },
+}
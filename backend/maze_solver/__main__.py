@@ -1,26 +1,46 @@
 import argparse
 import pathlib
 
-from maze_solver.graphs.solver import solve_all
-from maze_solver.models.maze import Maze
+from maze_solver.graphs.solver import solve
+from maze_solver.persistence.registry import layouts
 from maze_solver.view.renderer import SVGRenderer
 
 
 def main() -> None:
-    maze = Maze.load(parse_path())
-    solutions = solve_all(maze)
-    if solutions:
-        renderer = SVGRenderer()
-        for solution in solutions:
-            renderer.render(maze, solution).preview()
+    args = parse_args()
+    layout = layouts.get(args.path)
+    maze = layout.maze
+    squares = [maze.entrance, *(maze[i] for i in args.via), maze.exit]
+    positions = [(str(index), index) for index in args.via]
+    result = solve(
+        maze,
+        squares,
+        0,
+        positions,
+        graph=layout.compact,
+        table=layout.table,
+    )
+    if result:
+        solution, _ = result
+        SVGRenderer(labels=layout.labels or ()).preview(maze, solution)
     else:
         print("No solution found")
 
 
-def parse_path() -> pathlib.Path:
-    parser = argparse.ArgumentParser()
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Preview the shortest route from entrance to exit"
+    )
     parser.add_argument("path", type=pathlib.Path)
-    return parser.parse_args().path
+    parser.add_argument(
+        "--via",
+        type=int,
+        nargs="*",
+        default=[],
+        metavar="INDEX",
+        help="square indices to visit on the way, in the best order",
+    )
+    return parser.parse_args()
 
 
 if __name__ == "__main__":
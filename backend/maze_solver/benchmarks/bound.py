@@ -0,0 +1,64 @@
+import argparse
+import math
+import random
+import time
+
+from maze_solver.benchmarks.tour import random_cart
+from maze_solver.graphs.tour import (
+    BruteForce,
+    HeldKarp,
+    branch_and_bound,
+    tour_cost,
+)
+
+
+def main() -> None:
+    args = parse_args()
+    rng = random.Random(args.seed)
+    print(f"{'waypoints':>9} {'orders':>9} {'nodes':>9} "
+          f"{'b&b ms':>9} {'exact ms':>9}")
+    for size in args.sizes:
+        carts = [random_cart(rng, size) for _ in range(args.carts)]
+        nodes, bound_ms, exact_ms = [], 0.0, 0.0
+        for cart in carts:
+            end = len(cart) - 1
+            start = time.perf_counter()
+            explored = branch_and_bound(cart)
+            bound_ms += time.perf_counter() - start
+            start = time.perf_counter()
+            exact = (BruteForce() if size <= args.brute_limit else HeldKarp())
+            order = exact.order(cart)
+            exact_ms += time.perf_counter() - start
+            expected = tour_cost(cart, [0, *order, end])
+            assert math.isclose(explored.cost, expected), (
+                f"Branch and bound found {explored.cost}, not {expected}"
+            )
+            assert explored.cost == tour_cost(cart, [0, *explored.order, end])
+            nodes.append(explored.nodes)
+        print(
+            f"{size:>9} {math.factorial(size):>9} "
+            f"{sum(nodes) / len(nodes):>9.0f} "
+            f"{bound_ms * 1000 / len(carts):>9.2f} "
+            f"{exact_ms * 1000 / len(carts):>9.2f}"
+        )
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Check branch and bound against exhaustive search and "
+        "count the partial tours it explores"
+    )
+    parser.add_argument("sizes", type=int, nargs="*", default=[2, 4, 6, 8, 10])
+    parser.add_argument("--carts", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--brute-limit",
+        type=int,
+        default=8,
+        help="check larger carts against Held-Karp instead of brute force",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    main()
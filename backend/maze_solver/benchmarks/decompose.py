@@ -0,0 +1,181 @@
+import argparse
+import random
+import timeit
+
+from maze_solver.benchmarks.edges import random_maze
+from maze_solver.models.border import Border
+from maze_solver.view.decomposer import decompose
+from maze_solver.view.primitives import (
+    DisjointLines,
+    Line,
+    NullPrimitive,
+    Point,
+    Polygon,
+    Polyline,
+    Primitive,
+)
+
+
+def main() -> None:
+    args = parse_args()
+    for value in range(16):
+        border, top_left = Border(value), Point(3, 5)
+        assert decompose(border, top_left, args.size).draw() == (
+            decompose_reference(border, top_left, args.size).draw()
+        ), f"Outlines differ for {border!r}"
+    maze = random_maze(random.Random(args.seed), args.width, args.height)
+    size = args.size
+    squares = [
+        (square.border, Point(square.column * size, square.row * size))
+        for square in maze
+    ]
+    print(f"{len(squares)} squares, milliseconds per pass")
+    for name, function in [
+        ("if-chain", decompose_reference),
+        ("table", decompose),
+    ]:
+        milliseconds = measure(
+            lambda: [function(b, p, size) for b, p in squares], args.repeat
+        )
+        print(f"{name:>9} {milliseconds:8.3f}")
+
+
+def measure(function, repeat: int, number: int = 10) -> float:
+    best = min(timeit.repeat(function, number=number, repeat=repeat))
+    return best / number * 1000
+
+
+def decompose_reference(
+    border: Border, top_left: Point, square_size: int
+) -> Primitive:
+    """The original if-chain, kept to check and time the lookup table."""
+    top_right: Point = top_left.translate(x=square_size)
+    bottom_right: Point = top_left.translate(x=square_size, y=square_size)
+    bottom_left: Point = top_left.translate(y=square_size)
+
+    top = Line(top_left, top_right)
+    bottom = Line(bottom_left, bottom_right)
+    left = Line(top_left, bottom_left)
+    right = Line(top_right, bottom_right)
+
+    if border is Border.LEFT | Border.TOP | Border.RIGHT | Border.BOTTOM:
+        return Polygon(
+            [
+                top_left,
+                top_right,
+                bottom_right,
+                bottom_left,
+            ]
+        )
+
+    if border is Border.BOTTOM | Border.LEFT | Border.TOP:
+        return Polyline(
+            [
+                bottom_right,
+                bottom_left,
+                top_left,
+                top_right,
+            ]
+        )
+
+    if border is Border.LEFT | Border.TOP | Border.RIGHT:
+        return Polyline(
+            [
+                bottom_left,
+                top_left,
+                top_right,
+                bottom_right,
+            ]
+        )
+
+    if border is Border.TOP | Border.RIGHT | Border.BOTTOM:
+        return Polyline(
+            [
+                top_left,
+                top_right,
+                bottom_right,
+                bottom_left,
+            ]
+        )
+
+    if border is Border.RIGHT | Border.BOTTOM | Border.LEFT:
+        return Polyline(
+            [
+                top_right,
+                bottom_right,
+                bottom_left,
+                top_left,
+            ]
+        )
+
+    if border is Border.LEFT | Border.TOP:
+        return Polyline(
+            [
+                bottom_left,
+                top_left,
+                top_right,
+            ]
+        )
+
+    if border is Border.TOP | Border.RIGHT:
+        return Polyline(
+            [
+                top_left,
+                top_right,
+                bottom_right,
+            ]
+        )
+
+    if border is Border.BOTTOM | Border.LEFT:
+        return Polyline(
+            [
+                bottom_right,
+                bottom_left,
+                top_left,
+            ]
+        )
+
+    if border is Border.RIGHT | Border.BOTTOM:
+        return Polyline(
+            [
+                top_right,
+                bottom_right,
+                bottom_left,
+            ]
+        )
+
+    if border is Border.LEFT | Border.RIGHT:
+        return DisjointLines([left, right])
+
+    if border is Border.TOP | Border.BOTTOM:
+        return DisjointLines([top, bottom])
+
+    if border is Border.TOP:
+        return top
+
+    if border is Border.RIGHT:
+        return right
+
+    if border is Border.BOTTOM:
+        return bottom
+
+    if border is Border.LEFT:
+        return left
+
+    return NullPrimitive()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="If-chain versus lookup-table border decomposition"
+    )
+    parser.add_argument("--width", type=int, default=17)
+    parser.add_argument("--height", type=int, default=19)
+    parser.add_argument("--size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    main()
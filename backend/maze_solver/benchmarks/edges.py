@@ -0,0 +1,70 @@
+import argparse
+import random
+import timeit
+
+from maze_solver.graphs.converter import (
+    get_edge_arrays,
+    get_edges,
+    get_edges_vectorized,
+    get_nodes,
+    get_values,
+)
+from maze_solver.models.border import Border
+from maze_solver.models.maze import Maze
+from maze_solver.models.role import Role
+from maze_solver.models.square import Square
+
+
+def main() -> None:
+    args = parse_args()
+    rng = random.Random(args.seed)
+    print(f"{'squares':>9} {'edges':>7} {'get_edges ms':>13} "
+          f"{'vectorized ms':>14} {'arrays ms':>10}")
+    for side in args.sides:
+        maze = random_maze(rng, side, side)
+        nodes = get_nodes(maze)
+        edges = get_edges(maze, nodes)
+        assert get_edges_vectorized(maze, nodes) == edges, "Edge sets differ"
+        values = get_values(maze)
+        print(
+            f"{side * side:>9} {len(edges):>7} "
+            f"{measure(lambda: get_edges(maze, nodes), args.repeat):>13.2f} "
+            f"{measure(lambda: get_edges_vectorized(maze, nodes), args.repeat):>14.2f} "
+            f"{measure(lambda: get_edge_arrays(values, side, side), args.repeat):>10.2f}"
+        )
+
+
+def measure(function, repeat: int) -> float:
+    return min(timeit.repeat(function, number=1, repeat=repeat)) * 1000
+
+
+def random_maze(rng: random.Random, width: int, height: int) -> Maze:
+    roles = [Role.NONE] * 6 + [Role.WALL, Role.EXTERIOR, Role.ENEMY, Role.REWARD]
+    squares = []
+    for index in range(width * height):
+        row, column = divmod(index, width)
+        border = Border.EMPTY
+        for side in Border.TOP, Border.BOTTOM, Border.LEFT, Border.RIGHT:
+            if rng.random() < 0.3:
+                border |= side
+        role = rng.choice(roles)
+        if index == 0:
+            role = Role.ENTRANCE
+        elif index == width * height - 1:
+            role = Role.EXIT
+        squares.append(Square(index, row, column, border, role))
+    return Maze(tuple(squares))
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Pure-Python versus vectorized edge extraction"
+    )
+    parser.add_argument("sides", type=int, nargs="*", default=[20, 50, 100, 200])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import argparse
+import random
+import statistics
+import time
+
+from maze_solver.graphs.tour import (
+    CostMatrix,
+    HeldKarp,
+    LocalSearch,
+    TourEngine,
+    tour_cost,
+)
+
+
+def main() -> None:
+    args = parse_args()
+    rng = random.Random(args.seed)
+    print(f"{'waypoints':>9} {'exact ms':>9} {'heuristic ms':>12} "
+          f"{'mean gap':>9} {'max gap':>8}")
+    for size in args.sizes:
+        carts = [random_cart(rng, size) for _ in range(args.carts)]
+        exact_time, exact_costs = run(HeldKarp(), carts)
+        heuristic_time, heuristic_costs = run(LocalSearch(), carts)
+        gaps = [
+            heuristic / exact - 1 if exact else 0.0
+            for heuristic, exact in zip(heuristic_costs, exact_costs)
+        ]
+        print(
+            f"{size:>9} {exact_time:>9.2f} {heuristic_time:>12.2f} "
+            f"{statistics.mean(gaps):>9.2%} {max(gaps):>8.2%}"
+        )
+
+
+def run(engine: TourEngine, carts: list[CostMatrix]) -> tuple[float, list]:
+    costs, start = [], time.perf_counter()
+    for cart in carts:
+        order = engine.order(cart)
+        costs.append(tour_cost(cart, [0, *order, len(cart) - 1]))
+    elapsed_ms = (time.perf_counter() - start) * 1000 / len(carts)
+    return elapsed_ms, costs
+
+
+def random_cart(rng: random.Random, size: int) -> CostMatrix:
+    """Manhattan distances between random squares of a 17x19 store floor."""
+    squares = [(8, 16)]
+    squares += [(rng.randrange(19), rng.randrange(17)) for _ in range(size)]
+    squares += [(8, 0)]
+    return [
+        [abs(r1 - r2) + abs(c1 - c2) for r2, c2 in squares]
+        for r1, c1 in squares
+    ]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Optimality gap of LocalSearch against HeldKarp"
+    )
+    parser.add_argument("sizes", type=int, nargs="*", default=[4, 6, 8, 10])
+    parser.add_argument("--carts", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    main()
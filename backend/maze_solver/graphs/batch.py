@@ -0,0 +1,91 @@
+import os
+import pathlib
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Iterable
+
+from maze_solver.graphs.solver import RoutePlan, plan
+from maze_solver.graphs.tour import TourEngine
+from maze_solver.persistence.registry import layouts
+
+
+@dataclass(frozen=True)
+class Cart:
+    """Square indices from the start through every pickup to the end, and
+    the (name, shelf square) of each item."""
+
+    squares: tuple[int, ...]
+    positions: tuple[tuple[str, int], ...]
+    cart: str = ""
+
+
+@dataclass(frozen=True)
+class CartResult:
+    plan: RoutePlan | None
+    seconds: float
+
+
+# Set in every worker process by start_worker()
+worker_engine: TourEngine | None = None
+
+
+def solve_many(
+    layout_path: pathlib.Path,
+    carts: Iterable[Cart],
+    engine: TourEngine | None = None,
+    executor: Executor | None = None,
+    workers: int | None = None,
+) -> list[CartResult]:
+    """Plan many carts on one layout, in input order.
+
+    Carts are spread over the given executor, or over a process pool that
+    lives for this call only. Pass workers=0 to plan in this process.
+    """
+    carts = list(carts)
+    if executor is not None:
+        paths = [layout_path] * len(carts)
+        return list(executor.map(solve_cart, paths, carts))
+    if workers == 0 or len(carts) < 2:
+        start_worker(layout_path, engine)
+        return [solve_cart(layout_path, cart) for cart in carts]
+    with make_executor(layout_path, engine, workers) as executor:
+        return solve_many(layout_path, carts, executor=executor)
+
+
+def make_executor(
+    layout_path: pathlib.Path,
+    engine: TourEngine | None = None,
+    workers: int | None = None,
+) -> ProcessPoolExecutor:
+    """Process pool whose workers load the layout once, up front."""
+    return ProcessPoolExecutor(
+        max_workers=workers or os.cpu_count(),
+        initializer=start_worker,
+        initargs=(layout_path, engine),
+    )
+
+
+def start_worker(
+    layout_path: pathlib.Path, engine: TourEngine | None = None
+) -> None:
+    global worker_engine
+    worker_engine = engine
+    layouts.get(layout_path)
+
+
+def solve_cart(layout_path: pathlib.Path, cart: Cart) -> CartResult:
+    started = time.perf_counter()
+    # The registry hands back the loaded layout, or reloads a changed one
+    layout = layouts.get(layout_path)
+    maze = layout.maze
+    route_plan = plan(
+        maze,
+        squares=[maze[index] for index in cart.squares],
+        positions=cart.positions,
+        cart=cart.cart,
+        engine=worker_engine,
+        graph=layout.compact,
+        table=layout.table,
+    )
+    return CartResult(route_plan, time.perf_counter() - started)
@@ -0,0 +1,233 @@
+import array
+import math
+from dataclasses import dataclass
+from functools import cached_property
+from heapq import heappop, heappush
+from typing import Callable, Iterable, Iterator, NamedTuple, Sequence
+
+import numpy as np
+
+from maze_solver.graphs.converter import (
+    Node,
+    get_edge_arrays,
+    get_edge_weights,
+    get_values,
+)
+from maze_solver.graphs.matrix import LegMatrix
+from maze_solver.models.maze import MappedMaze, Maze
+
+Heuristic = Callable[[int, int], float]
+
+
+class SearchResult(NamedTuple):
+    path: list[int] | None
+    cost: float
+    expanded: int
+
+
+@dataclass(frozen=True)
+class CompactGraph:
+    """Directed graph in CSR form whose node ids are square indices.
+
+    The out-edges of node u are neighbours[offsets[u]:offsets[u + 1]], with
+    the matching weights at the same positions.
+    """
+
+    width: int
+    offsets: Sequence[int]
+    neighbours: Sequence[int]
+    weights: Sequence[float]
+
+    @classmethod
+    def from_maze(cls, maze: Maze | MappedMaze) -> "CompactGraph":
+        return cls.from_values(get_values(maze), maze.width, maze.height)
+
+    @classmethod
+    def from_values(
+        cls, values: np.ndarray, width: int, height: int
+    ) -> "CompactGraph":
+        """Build the graph straight from compressed square bytes."""
+        sources, targets = get_edge_arrays(values, width, height)
+        sources, targets = (
+            np.concatenate([sources, targets]),
+            np.concatenate([targets, sources]),
+        )
+        order = np.lexsort((targets, sources))
+        sources, targets = sources[order], targets[order]
+        weights = get_edge_weights(values, width, sources, targets)
+        counts = np.bincount(sources, minlength=width * height)
+        offsets = np.concatenate([[0], np.cumsum(counts)])
+        return cls(
+            width,
+            array.array("i", offsets.astype(np.int32).tobytes()),
+            array.array("i", targets.astype(np.int32).tobytes()),
+            array.array("d", weights.astype(np.float64).tobytes()),
+        )
+
+    @classmethod
+    def from_edges(
+        cls, width: int, size: int, edges: Iterable[tuple[int, int, float]]
+    ) -> "CompactGraph":
+        """Build the graph from (source, target, weight) sorted by source."""
+        offsets = array.array("i", [0]) * (size + 1)
+        neighbours, weights = array.array("i"), array.array("d")
+        for source, target, weight in edges:
+            offsets[source + 1] += 1
+            neighbours.append(target)
+            weights.append(weight)
+        for node in range(size):
+            offsets[node + 1] += offsets[node]
+        return cls(width, offsets, neighbours, weights)
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __contains__(self, node: int) -> bool:
+        return 0 <= node < len(self) and self.offsets[node] < self.offsets[node + 1]
+
+    @property
+    def nodes(self) -> Iterator[int]:
+        return (node for node in range(len(self)) if node in self)
+
+    def edges(self) -> Iterator[tuple[int, int, float]]:
+        for node in range(len(self)):
+            for k in range(self.offsets[node], self.offsets[node + 1]):
+                yield node, self.neighbours[k], self.weights[k]
+
+    def weight(self, source: int, target: int) -> float:
+        for k in range(self.offsets[source], self.offsets[source + 1]):
+            if self.neighbours[k] == target:
+                return self.weights[k]
+        return math.inf
+
+    @cached_property
+    def symmetric(self) -> bool:
+        return all(
+            self.weight(target, source) == weight
+            for source, target, weight in self.edges()
+        )
+
+    def dijkstra(
+        self, source: int, targets: Iterable[int] | None = None
+    ) -> tuple[dict[int, float], list[int]]:
+        """Search from source until every reachable target is settled.
+
+        Returns the settled distances and the predecessor of every node
+        reached, with -1 for the others.
+        """
+        offsets, neighbours, weights = self.offsets, self.neighbours, self.weights
+        distances = [math.inf] * len(self)
+        predecessors = [-1] * len(self)
+        settled: dict[int, float] = {}
+        if source not in self:
+            return settled, predecessors
+        remaining = None if targets is None else set(targets)
+        distances[source] = 0.0
+        queue = [(0.0, source)]
+        while queue:
+            distance, node = heappop(queue)
+            if node in settled:
+                continue
+            settled[node] = distance
+            if remaining is not None:
+                remaining.discard(node)
+                if not remaining:
+                    break
+            for k in range(offsets[node], offsets[node + 1]):
+                neighbour = neighbours[k]
+                candidate = distance + weights[k]
+                if candidate < distances[neighbour]:
+                    distances[neighbour] = candidate
+                    predecessors[neighbour] = node
+                    heappush(queue, (candidate, neighbour))
+        return settled, predecessors
+
+    @cached_property
+    def heuristic_scale(self) -> float:
+        """Largest factor keeping a grid-distance heuristic admissible."""
+        # Edges run along rows or columns, so the smallest weight per unit
+        # of length bounds every path, bonuses and penalties included.
+        return min(
+            (
+                weight / self.manhattan(source, target)
+                for source, target, weight in self.edges()
+            ),
+            default=1.0,
+        )
+
+    def astar(
+        self, source: int, target: int, heuristic: Heuristic | None = None
+    ) -> SearchResult:
+        """Return the shortest path between two nodes and its cost."""
+        heuristic = heuristic or self.euclidean
+        offsets, neighbours, weights = self.offsets, self.neighbours, self.weights
+        if source not in self or target not in self:
+            return SearchResult(None, math.inf, 0)
+        distances = {source: 0.0}
+        predecessors = {source: -1}
+        closed = set()
+        queue = [(heuristic(source, target), 0.0, source)]
+        while queue:
+            _, distance, node = heappop(queue)
+            if node == target:
+                path = unwind(predecessors, target)
+                return SearchResult(path, distance, len(closed))
+            if node in closed:
+                continue
+            closed.add(node)
+            for k in range(offsets[node], offsets[node + 1]):
+                neighbour = neighbours[k]
+                candidate = distance + weights[k]
+                if candidate < distances.get(neighbour, math.inf):
+                    distances[neighbour] = candidate
+                    predecessors[neighbour] = node
+                    estimate = candidate + heuristic(neighbour, target)
+                    heappush(queue, (estimate, candidate, neighbour))
+        return SearchResult(None, math.inf, len(closed))
+
+    def shortest_path(self, source: int, target: int) -> SearchResult:
+        """Point-to-point Dijkstra, stopping as soon as target is settled."""
+        settled, predecessors = self.dijkstra(source, [target])
+        if target not in settled:
+            return SearchResult(None, math.inf, len(settled))
+        path = [target]
+        while path[-1] != source:
+            path.append(predecessors[path[-1]])
+        return SearchResult(path[::-1], settled[target], len(settled))
+
+    def euclidean(self, node: int, target: int) -> float:
+        return math.dist(divmod(node, self.width), divmod(target, self.width))
+
+    def manhattan(self, node: int, target: int) -> float:
+        (row, column), (target_row, target_column) = (
+            divmod(node, self.width),
+            divmod(target, self.width),
+        )
+        return abs(row - target_row) + abs(column - target_column)
+
+    def legs(self, maze: Maze, nodes: Sequence[Node]) -> "CompactLegs":
+        matrix = LegMatrix.from_search(
+            self.dijkstra, [node.index for node in nodes], self.symmetric
+        )
+        return CompactLegs(maze, matrix)
+
+
+@dataclass(frozen=True)
+class CompactLegs:
+    maze: Maze
+    matrix: LegMatrix
+
+    @property
+    def costs(self) -> list[list[float]]:
+        return self.matrix.costs
+
+    def path(self, i: int, j: int) -> list[Node] | None:
+        path = self.matrix.path(i, j)
+        return None if path is None else [self.maze[k] for k in path]
+
+
+def unwind(predecessors: dict[int, int], node: int) -> list[int]:
+    path = [node]
+    while (node := predecessors[node]) != -1:
+        path.append(node)
+    return path[::-1]
@@ -2,9 +2,10 @@ import math
 from typing import NamedTuple, TypeAlias
 
 import networkx as nx
+import numpy as np
 
 from maze_solver.models.border import Border
-from maze_solver.models.maze import Maze
+from maze_solver.models.maze import MappedMaze, Maze
 from maze_solver.models.role import Role
 from maze_solver.models.square import Square
 
@@ -36,10 +37,19 @@ class Edge(NamedTuple):
                 return self.distance
 
 
-def make_graph(maze: Maze) -> nx.DiGraph:
+def make_graph(maze: Maze | MappedMaze) -> nx.DiGraph:
+    values = get_values(maze)
+    sources, targets = get_edge_arrays(values, maze.width, maze.height)
+    sources, targets = (
+        np.concatenate([sources, targets]),
+        np.concatenate([targets, sources]),
+    )
+    weights = get_edge_weights(values, maze.width, sources, targets)
     return nx.DiGraph(
-        (edge.node1, edge.node2, {"weight": edge.weight()})
-        for edge in get_directed_edges(maze, get_nodes(maze))
+        (maze[source], maze[target], {"weight": weight})
+        for source, target, weight in zip(
+            sources.tolist(), targets.tolist(), weights.tolist()
+        )
     )
 
 
@@ -78,3 +88,83 @@ def get_edges(maze: Maze, nodes: set[Node]) -> set[Edge]:
                 edges.add(Edge(source_node, node))
                 break
     return edges
+
+
+def get_edges_vectorized(maze: Maze, nodes: set[Node]) -> set[Edge]:
+    """Same edges as get_edges(), found with whole-grid array operations."""
+    values = get_values(maze)
+    is_node = np.zeros(len(maze.squares), dtype=bool)
+    is_node[[node.index for node in nodes]] = True
+    sources, targets = get_edge_arrays(values, maze.width, maze.height, is_node)
+    squares = maze.squares
+    return {
+        Edge(squares[source], squares[target])
+        for source, target in zip(sources.tolist(), targets.tolist())
+    }
+
+
+def get_values(maze: Maze | MappedMaze) -> np.ndarray:
+    """Return the compressed square bytes, as stored in a .maze file."""
+    return np.frombuffer(maze.values, dtype=np.uint8)
+
+
+def get_edge_arrays(
+    values: np.ndarray,
+    width: int,
+    height: int,
+    is_node: np.ndarray | None = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return the square indices at both ends of every edge.
+
+    The values are the compressed square bytes of the .maze file format.
+    When no node mask is given, every square that is neither a wall nor
+    exterior is a node, just like in get_nodes().
+    """
+    grid = np.asarray(values, dtype=np.uint8).reshape(height, width)
+    borders, roles = grid & 0xF, grid >> 4
+    if is_node is None:
+        is_node = (roles != Role.EXTERIOR) & (roles != Role.WALL)
+    is_node = np.asarray(is_node, dtype=bool).reshape(height, width)
+
+    rows, lefts, rights = follow(is_node, (borders & Border.RIGHT) != 0)
+    columns, tops, bottoms = follow(is_node.T, (borders & Border.BOTTOM).T != 0)
+    sources = np.concatenate([rows * width + lefts, tops * width + columns])
+    targets = np.concatenate([rows * width + rights, bottoms * width + columns])
+    return sources, targets
+
+
+def get_edge_weights(
+    values: np.ndarray,
+    width: int,
+    sources: np.ndarray,
+    targets: np.ndarray,
+    bonus=1,
+    penalty=2,
+) -> np.ndarray:
+    """Vectorized Edge.weight() for edges leading from sources to targets."""
+    rows, columns = np.divmod(sources, width)
+    target_rows, target_columns = np.divmod(targets, width)
+    weights = np.hypot(target_rows - rows, target_columns - columns)
+    roles = np.asarray(values, dtype=np.uint8)[targets] >> 4
+    weights[roles == Role.REWARD] -= bonus
+    weights[roles == Role.ENEMY] += penalty
+    return weights
+
+
+def follow(
+    is_node: np.ndarray, walls: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Pair every node with the next node further along its row, unless a
+    wall lies in between. Returns the rows, source and target columns."""
+    height, width = is_node.shape
+    columns = np.where(is_node, np.arange(width), width)
+    nearest = np.minimum.accumulate(columns[:, ::-1], axis=1)[:, ::-1]
+    following = np.full_like(nearest, width)
+    following[:, :-1] = nearest[:, 1:]
+    # crossed[y, x] counts the walls on the far side of columns 0..x-1
+    crossed = np.zeros((height, width + 1), dtype=np.intp)
+    np.cumsum(walls, axis=1, out=crossed[:, 1:])
+    rows, starts = np.nonzero(is_node & (following < width))
+    ends = following[rows, starts]
+    unblocked = crossed[rows, ends] == crossed[rows, starts]
+    return rows[unblocked], starts[unblocked], ends[unblocked]
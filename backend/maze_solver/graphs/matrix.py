@@ -0,0 +1,94 @@
+import math
+from dataclasses import dataclass
+from functools import partial
+from heapq import heappop, heappush
+from itertools import count
+from typing import Callable, Iterable, Mapping, TypeAlias
+
+import networkx as nx
+
+from maze_solver.graphs.converter import Node
+
+# Single-source search returning the settled distances and predecessors
+Search: TypeAlias = Callable[
+    [Node, Iterable[Node]], tuple[Mapping[Node, float], Mapping[Node, Node]]
+]
+
+
+@dataclass(frozen=True)
+class LegMatrix:
+    nodes: tuple[Node, ...]
+    costs: list[list[float]]
+    predecessors: list[Mapping[Node, Node]]
+    symmetric: bool
+
+    @classmethod
+    def build(cls, graph: nx.DiGraph, nodes: Iterable[Node]) -> "LegMatrix":
+        search = partial(dijkstra, graph)
+        return cls.from_search(search, nodes, is_symmetric(graph))
+
+    @classmethod
+    def from_search(
+        cls, search: Search, nodes: Iterable[Node], symmetric: bool
+    ) -> "LegMatrix":
+        nodes = tuple(nodes)
+        costs = [[math.inf] * len(nodes) for _ in nodes]
+        predecessors = []
+        for i, source in enumerate(nodes):
+            costs[i][i] = 0.0
+            # With symmetric weights the legs into earlier nodes are the
+            # reversed legs out of them, so only later nodes are searched.
+            targets = nodes[i + 1 :] if symmetric else nodes
+            distances, tree = search(source, targets)
+            predecessors.append(tree)
+            for j in range(i + 1 if symmetric else 0, len(nodes)):
+                costs[i][j] = distances.get(nodes[j], math.inf)
+                if symmetric:
+                    costs[j][i] = costs[i][j]
+        return cls(nodes, costs, predecessors, symmetric)
+
+    def path(self, i: int, j: int) -> list[Node] | None:
+        if not math.isfinite(self.costs[i][j]):
+            return None
+        if self.symmetric and j < i:
+            return self.path(j, i)[::-1]
+        tree, node = self.predecessors[i], self.nodes[j]
+        path = [node]
+        while node != self.nodes[i]:
+            node = tree[node]
+            path.append(node)
+        return path[::-1]
+
+
+def dijkstra(
+    graph: nx.DiGraph, source: Node, targets: Iterable[Node]
+) -> tuple[dict[Node, float], dict[Node, Node]]:
+    """Search from source until every reachable target is settled."""
+    if source not in graph:
+        return {}, {}
+    distances: dict[Node, float] = {source: 0}
+    predecessors: dict[Node, Node] = {}
+    remaining = set(targets)
+    settled: set[Node] = set()
+    tiebreak = count()
+    queue = [(0.0, next(tiebreak), source)]
+    while queue and remaining:
+        distance, _, node = heappop(queue)
+        if node in settled:
+            continue
+        settled.add(node)
+        remaining.discard(node)
+        for neighbour, data in graph.adj[node].items():
+            candidate = distance + data["weight"]
+            if candidate < distances.get(neighbour, math.inf):
+                distances[neighbour] = candidate
+                predecessors[neighbour] = node
+                heappush(queue, (candidate, next(tiebreak), neighbour))
+    return {node: distances[node] for node in settled}, predecessors
+
+
+def is_symmetric(graph: nx.DiGraph) -> bool:
+    return all(
+        graph.has_edge(v, u) and graph.adj[v][u]["weight"] == weight
+        for u, v, weight in graph.edges(data="weight")
+    )
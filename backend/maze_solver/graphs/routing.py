@@ -0,0 +1,29 @@
+from enum import StrEnum
+
+from maze_solver.graphs.compact import CompactGraph, SearchResult
+
+
+class Heuristic(StrEnum):
+    EUCLIDEAN = "euclidean"
+    MANHATTAN = "manhattan"
+
+
+def route(
+    graph: CompactGraph,
+    source: int,
+    target: int,
+    heuristic: Heuristic = Heuristic.MANHATTAN,
+) -> SearchResult:
+    """Find a single leg between two square indices.
+
+    Uses A* with a grid-distance heuristic, or plain Dijkstra when the
+    weights leave no admissible scale for it (e.g. a REWARD bonus that
+    makes some step free).
+    """
+    scale = graph.heuristic_scale
+    if scale <= 0:
+        return graph.shortest_path(source, target)
+    metric = (
+        graph.manhattan if heuristic is Heuristic.MANHATTAN else graph.euclidean
+    )
+    return graph.astar(source, target, lambda node, goal: scale * metric(node, goal))
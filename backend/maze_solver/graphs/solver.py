@@ -1,82 +1,189 @@
+import time
+from dataclasses import dataclass
+
 import networkx as nx
-from itertools import permutations
 
+from maze_solver.graphs.compact import CompactGraph
 from maze_solver.graphs.converter import make_graph
+from maze_solver.graphs.matrix import LegMatrix
+from maze_solver.graphs.routing import route
+from maze_solver.graphs.table import DistanceTable
+from maze_solver.graphs.tour import Anytime, Auto, TourEngine
 from maze_solver.models.maze import Maze
 from maze_solver.models.solution import Solution
 
 
-def solve(maze: Maze, squares, count, positions) -> Solution | None:
-    if len(squares) < 2:
-        raise ValueError("At least two squares are required")
+@dataclass(frozen=True)
+class RoutePlan:
+    """Optimized visiting order of a cart, advanced one item at a time."""
+
+    cart: str
+    stops: tuple[int, ...]
+    positions: tuple[tuple[str, int], ...]
+    optimal: bool | None = None
+    gap: float | None = None
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RoutePlan":
+        return cls(
+            data["cart"],
+            tuple(data["stops"]),
+            tuple((name, index) for name, index in data["positions"]),
+            data.get("optimal"),
+            data.get("gap"),
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "cart": self.cart,
+            "stops": list(self.stops),
+            "positions": [list(position) for position in self.positions],
+            "optimal": self.optimal,
+            "gap": self.gap,
+        }
+
+    def step(
+        self,
+        maze: Maze,
+        count: int,
+        graph: CompactGraph | None = None,
+        table: DistanceTable | None = None,
+    ) -> tuple[Solution, str] | None:
+        """Return the leg leading to the item at position count."""
+        source, target = self.stops[count], self.stops[count + 1]
+        if table is not None:
+            leg = table.route(source, target)
+        else:
+            leg = route(graph or CompactGraph.from_maze(maze), source, target).path
+        if leg is None:
+            return None
+        name, current = self.positions[count]
+        solution = Solution(
+            squares=tuple(maze[i] for i in leg),
+            current=current,
+            optimal=self.optimal,
+            gap=self.gap,
+        )
+        return solution, name
+
+
+def plan(
+    maze: Maze,
+    squares,
+    positions,
+    cart: str = "",
+    engine: TourEngine | None = None,
+    graph: nx.DiGraph | CompactGraph | None = None,
+    table: DistanceTable | None = None,
+    deadline_ms: float | None = None,
+) -> RoutePlan | None:
+    """Optimize the visiting order of a cart.
+
+    With deadline_ms the whole call, legs included, returns within about
+    that many milliseconds with the best order found so far.
+    """
+    deadline = deadline_from(deadline_ms)
+    stops, groups = collapse(squares)
+    legs = make_legs(maze, stops, graph, table)
+    order, optimal, gap = find_order(legs.costs, engine, deadline)
+    if order is None:
+        return None
+    order = [item for stop in order for item in groups[stop - 1]]
+    return RoutePlan(
+        cart,
+        tuple(squares[i].index for i in [0, *order, len(squares) - 1]),
+        tuple(positions[i - 1] for i in order) + (("EXIT", 136),),
+        optimal,
+        gap,
+    )
+
+
+def solve(
+    maze: Maze,
+    squares,
+    count,
+    positions,
+    engine: TourEngine | None = None,
+    graph: nx.DiGraph | CompactGraph | None = None,
+    table: DistanceTable | None = None,
+    deadline_ms: float | None = None,
+) -> Solution | None:
+    deadline = deadline_from(deadline_ms)
+    stops, groups = collapse(squares)
+    legs = make_legs(maze, stops, graph, table)
+
+    order, optimal, gap = find_order(legs.costs, engine, deadline)
+    if order is None:
+        return None
+
+    # One leg per item, items sharing a stop getting a leg that stays put
+    best_tour = [0, *(stop for stop in order for _ in groups[stop - 1]), len(stops) - 1][count:]
+    final_pos = [positions[i - 1] for stop in order for i in groups[stop - 1]]
 
-    graph = make_graph(maze)
-
-    # Precompute all pairwise shortest paths + costs between squares
-    pairs = []
-    nodes = squares
-    for i in range(len(nodes)):
-        for j in range(len(nodes)):
-            if i != j:
-                pairs.append((nodes[i], nodes[j]))
-
-    path_cache = {}
-    for u, v in pairs:
-        try:
-            path = nx.shortest_path(graph, source=u, target=v, weight="weight")
-            cost = nx.shortest_path_length(graph, source=u, target=v, weight="weight")
-            path_cache[(u, v)] = (path, cost)
-        except nx.NetworkXException:
-            # No path between u and v
-            path_cache[(u, v)] = None
-
-    start = squares[0]
-    waypoints = squares[1:-1] if len(squares) > 2 else []
-    end = squares[-1]
-
-    best_tour = None
-    best_cost = float("inf")
-    final_pos = None
-
-    for permutation in permutations(list(zip(waypoints, positions))):
-        perm = [permutation[i][0] for i in range(len(permutation))]
-        pos = [permutation[i][1] for i in range(len(permutation))]
-
-        tour = [start] + list(perm) + [end]
-        total_cost = 0
-        valid = True
-
-        for i in range(len(tour) - 1):
-            key = (tour[i], tour[i + 1])
-            result = path_cache.get(key)
-            if result is None:
-                valid = False
-                break
-            partial, cost = result
-            total_cost += cost
-
-        if valid and total_cost < best_cost:
-            best_cost = total_cost
-            best_tour = tour
-            final_pos = pos
-
-    best_tour = best_tour[count:]
     best_path = []
     for i in range(len(best_tour) - 1):
-        key = (best_tour[i], best_tour[i + 1])
-        result = path_cache.get(key)
-        if result is None:
-            valid = False
-            break
-        partial, cost = result
+        partial = legs.path(best_tour[i], best_tour[i + 1])
         if i==0:
             best_path.extend(partial)
         else:
             best_path.extend(partial[1:])
 
     final_pos.append(('EXIT', 136))
-    print(final_pos)
     if best_path:
-        return Solution(squares=tuple(best_path), current = final_pos[count][1]), final_pos[count][0]
+        return Solution(squares=tuple(best_path), current = final_pos[count][1], optimal=optimal, gap=gap), final_pos[count][0]
     else:
         return None
+
+
+def collapse(squares) -> tuple[list, list[list[int]]]:
+    """Merge waypoints on the same square into a single stop.
+
+    Return the start, each distinct waypoint square and the end, with the
+    item numbers (positions in squares) picked up at every stop. Stops and
+    the items within them keep the order they first appear in.
+    """
+    if len(squares) < 2:
+        raise ValueError("At least two squares are required")
+    groups: dict[int, list[int]] = {}
+    for item, square in enumerate(squares[1:-1], start=1):
+        groups.setdefault(square.index, []).append(item)
+    items = list(groups.values())
+    stops = [squares[0], *(squares[group[0]] for group in items), squares[-1]]
+    return stops, items
+
+
+def deadline_from(deadline_ms: float | None) -> float | None:
+    if deadline_ms is None:
+        return None
+    return time.perf_counter() + deadline_ms / 1000
+
+
+def find_order(
+    costs, engine: TourEngine | None, deadline: float | None
+) -> tuple[list[int] | None, bool | None, float | None]:
+    """Return the visiting order, whether it is optimal, and its gap."""
+    if deadline is None:
+        return (engine or Auto()).order(costs), None, None
+    if engine is not None and not isinstance(engine, Anytime):
+        raise ValueError("Only the Anytime engine can stop at a deadline")
+    result = (engine or Anytime()).search(costs, deadline)
+    return result.order, result.optimal, result.gap
+
+
+def make_legs(
+    maze: Maze,
+    squares,
+    graph: nx.DiGraph | CompactGraph | None = None,
+    table: DistanceTable | None = None,
+):
+    if len(squares) < 2:
+        raise ValueError("At least two squares are required")
+
+    if table is not None:
+        # Precomputed layouts only need lookups and path reconstruction
+        return table.legs(maze, squares)
+    elif isinstance(graph, CompactGraph):
+        return graph.legs(maze, squares)
+    else:
+        # One early-terminating Dijkstra per square fills every leg at once
+        return LegMatrix.build(graph or make_graph(maze), squares)
@@ -0,0 +1,192 @@
+import array
+import hashlib
+import math
+import mmap
+import os
+import pathlib
+import struct
+import tempfile
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Sequence
+
+import networkx as nx
+
+from maze_solver.graphs.converter import Node, make_graph
+from maze_solver.models.maze import Maze
+
+MAGIC_NUMBER: bytes = b"APSP"
+FORMAT_VERSION: int = 1
+# Magic number, format version, node count and the layout digest, padded so
+# that the float64 distance section starts on an 8-byte boundary.
+HEADER = struct.Struct("<4sBI32s7x")
+NO_HOP: int = -1
+
+
+@dataclass(frozen=True)
+class DistanceTable:
+    """All-pairs distances and next hops between the nodes of a layout."""
+
+    digest: bytes
+    squares: Sequence[int]
+    distances: Sequence[float]
+    next_hops: Sequence[int]
+
+    @classmethod
+    def build(cls, maze: Maze, digest: bytes = b"") -> "DistanceTable":
+        graph = make_graph(maze)
+        nodes = sorted(graph.nodes, key=lambda node: node.index)
+        ids = {node: i for i, node in enumerate(nodes)}
+        size = len(nodes)
+        distances = array.array("d", [math.inf]) * (size * size)
+        next_hops = array.array("i", [NO_HOP]) * (size * size)
+        for source in nodes:
+            row = ids[source] * size
+            lengths, paths = nx.single_source_dijkstra(graph, source)
+            for target, path in paths.items():
+                distances[row + ids[target]] = lengths[target]
+                next_hops[row + ids[target]] = ids[path[min(1, len(path) - 1)]]
+        squares = array.array("i", (node.index for node in nodes))
+        return cls(digest.ljust(32, b"\0"), squares, distances, next_hops)
+
+    @classmethod
+    def load(cls, path: pathlib.Path) -> "DistanceTable":
+        with path.open("rb") as file:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls.from_buffer(memoryview(buffer))
+
+    @classmethod
+    def from_buffer(cls, view: memoryview) -> "DistanceTable":
+        """Wrap a serialized table without copying its sections."""
+        if len(view) < HEADER.size:
+            raise ValueError("Truncated distance table")
+        magic, format_version, size, digest = HEADER.unpack_from(view)
+        assert magic == MAGIC_NUMBER, "Unknown file type"
+        if format_version != FORMAT_VERSION:
+            raise ValueError("Unsupported file format version")
+        if len(view) < HEADER.size + 12 * size * size + 4 * size:
+            raise ValueError("Truncated distance table")
+        start = HEADER.size
+        distances = view[start : (start := start + 8 * size * size)]
+        next_hops = view[start : (start := start + 4 * size * size)]
+        squares = view[start : start + 4 * size]
+        return cls(
+            digest,
+            squares.cast("i"),
+            distances.cast("d"),
+            next_hops.cast("i"),
+        )
+
+    @classmethod
+    def load_or_build(
+        cls, maze_path: pathlib.Path, path: pathlib.Path | None = None
+    ) -> "DistanceTable":
+        """Memory-map the table stored at path (by default next to the .maze
+        file), rebuilding it first when it is missing or was computed for a
+        different layout. A table that cannot be saved is kept in memory."""
+        digest = hashlib.sha256(maze_path.read_bytes()).digest()
+        path = path or table_path(maze_path)
+        if path.exists():
+            try:
+                table = cls.load(path)
+            except ValueError:
+                pass  # Left incomplete by an older writer, so rebuild it
+            else:
+                if table.digest == digest:
+                    return table
+        table = cls.build(Maze.load(maze_path), digest)
+        try:
+            table.dump(path)
+        except OSError:
+            # e.g. a read-only deploy, where every process builds its own
+            return table
+        return cls.load(path)
+
+    def dump(self, path: pathlib.Path) -> None:
+        # Other processes may have the old file mapped, or be about to map
+        # this one, so it is never truncated or seen half-written
+        with tempfile.NamedTemporaryFile(
+            dir=path.parent, prefix=path.name, suffix=".tmp", delete=False
+        ) as file:
+            file.write(self.to_bytes())
+        try:
+            os.replace(file.name, path)
+        except OSError:
+            os.unlink(file.name)
+            raise
+
+    def to_bytes(self) -> bytes:
+        return b"".join(
+            [
+                HEADER.pack(
+                    MAGIC_NUMBER,
+                    FORMAT_VERSION,
+                    len(self.squares),
+                    self.digest,
+                ),
+                array.array("d", self.distances).tobytes(),
+                array.array("i", self.next_hops).tobytes(),
+                array.array("i", self.squares).tobytes(),
+            ]
+        )
+
+    @cached_property
+    def ids(self) -> dict[int, int]:
+        return {square: i for i, square in enumerate(self.squares)}
+
+    def distance(self, source: int, target: int) -> float:
+        """Return the shortest distance between two square indices."""
+        ids = self.ids
+        if source not in ids or target not in ids:
+            return math.inf
+        return self.distances[ids[source] * len(self.squares) + ids[target]]
+
+    def route(self, source: int, target: int) -> list[int] | None:
+        """Return the square indices along the shortest path, or None."""
+        if not math.isfinite(self.distance(source, target)):
+            return None
+        ids, size = self.ids, len(self.squares)
+        node, goal = ids[source], ids[target]
+        route = [source]
+        while node != goal:
+            node = self.next_hops[node * size + goal]
+            route.append(self.squares[node])
+        return route
+
+    def legs(self, maze: Maze, nodes: Sequence[Node]) -> "TableLegs":
+        return TableLegs(self, maze, tuple(nodes))
+
+
+@dataclass(frozen=True)
+class TableLegs:
+    table: DistanceTable
+    maze: Maze
+    nodes: tuple[Node, ...]
+
+    @cached_property
+    def costs(self) -> list[list[float]]:
+        return [
+            [self.table.distance(u.index, v.index) for v in self.nodes]
+            for u in self.nodes
+        ]
+
+    def path(self, i: int, j: int) -> list[Node] | None:
+        route = self.table.route(self.nodes[i].index, self.nodes[j].index)
+        return None if route is None else [self.maze[k] for k in route]
+
+
+def table_path(
+    maze_path: pathlib.Path, directory: pathlib.Path | None = None
+) -> pathlib.Path:
+    path = maze_path.with_suffix(".apsp")
+    return path if directory is None else pathlib.Path(directory) / path.name
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Precompute a distance table")
+    parser.add_argument("path", type=pathlib.Path)
+    maze_path = parser.parse_args().path
+    table = DistanceTable.load_or_build(maze_path)
+    print(f"{table_path(maze_path)}: {len(table.squares)} nodes")
@@ -0,0 +1,328 @@
+import math
+import time
+from dataclasses import dataclass, field
+from itertools import permutations
+from typing import NamedTuple, Protocol, Sequence, TypeAlias
+
+# Square matrix of leg costs. Row/column 0 is the start, the last one is the
+# end and everything in between is a waypoint. Unreachable legs are math.inf.
+CostMatrix: TypeAlias = Sequence[Sequence[float]]
+
+
+class TourEngine(Protocol):
+    def order(self, costs: CostMatrix) -> list[int] | None:
+        """Return the waypoint indices in visiting order, or None."""
+        ...
+
+
+@dataclass(frozen=True)
+class BruteForce:
+    def order(self, costs: CostMatrix) -> list[int] | None:
+        end = len(costs) - 1
+        best_order, best_cost = None, math.inf
+        for permutation in permutations(range(1, end)):
+            cost = tour_cost(costs, [0, *permutation, end])
+            if cost < best_cost:
+                best_order, best_cost = list(permutation), cost
+        return best_order
+
+
+@dataclass(frozen=True)
+class HeldKarp:
+    """Exact dynamic programme, O(2^n n^2) in the number of waypoints.
+
+    Refuses carts above max_waypoints: 12 take well under a second, while
+    each waypoint past that roughly doubles the time and memory.
+    """
+
+    max_waypoints: int = 12
+
+    def order(self, costs: CostMatrix) -> list[int] | None:
+        n = len(costs) - 2
+        if n > self.max_waypoints:
+            raise ValueError(f"Too many waypoints for Held-Karp: {n}")
+        return held_karp(costs)
+
+
+@dataclass(frozen=True)
+class BranchAndBound:
+    """Exact depth-first search that prunes on a lower bound.
+
+    Refuses carts above max_waypoints, as in the worst case it explores
+    every partial tour; see HeldKarp.
+    """
+
+    max_waypoints: int = 12
+
+    def order(self, costs: CostMatrix) -> list[int] | None:
+        n = len(costs) - 2
+        if n > self.max_waypoints:
+            raise ValueError(f"Too many waypoints for branch and bound: {n}")
+        return branch_and_bound(costs).order
+
+
+@dataclass(frozen=True)
+class LocalSearch:
+    time_budget_ms: float = 30
+    max_iterations: int = 10_000
+
+    def order(self, costs: CostMatrix) -> list[int] | None:
+        deadline = time.perf_counter() + self.time_budget_ms / 1000
+        tour = nearest_neighbour(costs)
+        for _ in range(self.max_iterations):
+            if time.perf_counter() > deadline:
+                break
+            if not (two_opt(costs, tour) or or_opt(costs, tour)):
+                break
+        if not math.isfinite(tour_cost(costs, tour)):
+            return None
+        return tour[1:-1]
+
+
+@dataclass(frozen=True)
+class Auto:
+    exact: TourEngine = field(default_factory=HeldKarp)
+    heuristic: TourEngine = field(default_factory=LocalSearch)
+    exact_limit: int = 12
+
+    def order(self, costs: CostMatrix) -> list[int] | None:
+        if len(costs) - 2 <= self.exact_limit:
+            return self.exact.order(costs)
+        return self.heuristic.order(costs)
+
+
+class TourResult(NamedTuple):
+    order: list[int] | None
+    cost: float
+    optimal: bool
+    lower_bound: float
+
+    @property
+    def gap(self) -> float:
+        """How far above optimal the cost may be, relative to the bound."""
+        if self.optimal or self.cost <= self.lower_bound:
+            return 0.0
+        if self.lower_bound <= 0:
+            return math.inf
+        return (self.cost - self.lower_bound) / self.lower_bound
+
+
+@dataclass(frozen=True)
+class Anytime:
+    """Improves a greedy seed until the deadline, then solves exactly if
+    time and the cart size allow, which also finds tours the seed missed."""
+
+    deadline_ms: float = 50
+    exact_limit: int = 12
+
+    def order(self, costs: CostMatrix) -> list[int] | None:
+        return self.search(costs).order
+
+    def search(
+        self, costs: CostMatrix, deadline: float | None = None
+    ) -> TourResult:
+        if deadline is None:
+            deadline = time.perf_counter() + self.deadline_ms / 1000
+        tour = nearest_neighbour(costs)
+        while time.perf_counter() < deadline:
+            if not (two_opt(costs, tour) or or_opt(costs, tour)):
+                break
+        cost = tour_cost(costs, tour)
+        if len(costs) - 2 <= self.exact_limit:
+            # Also when the seed hit an unreachable leg, as a greedy dead end
+            # does not mean there is no tour at all
+            try:
+                order = held_karp(costs, deadline)
+            except TimeoutError:
+                pass
+            else:
+                if order is None:
+                    return TourResult(None, math.inf, True, math.inf)
+                exact = tour_cost(costs, [0, *order, len(costs) - 1])
+                return TourResult(order, exact, True, exact)
+        if not math.isfinite(cost):
+            return TourResult(None, math.inf, False, lower_bound(costs))
+        return TourResult(tour[1:-1], cost, False, lower_bound(costs))
+
+
+class Explored(NamedTuple):
+    order: list[int] | None
+    cost: float
+    nodes: int
+
+
+def branch_and_bound(costs: CostMatrix) -> Explored:
+    """Exact visiting order by depth-first search over partial tours.
+
+    A partial tour is abandoned once its cost plus a lower bound on the
+    rest reaches the best complete tour so far. Every stop still to leave
+    takes at least its cheapest outgoing leg and every stop still to enter
+    its cheapest incoming one; the larger of the two sums is the bound.
+    """
+    end = len(costs) - 1
+    # The start is never entered again and the end is never left
+    cheapest_out = [
+        min((costs[u][v] for v in range(1, end + 1) if v != u), default=0)
+        for u in range(end + 1)
+    ]
+    cheapest_in = [
+        min((costs[u][v] for u in range(end) if u != v), default=0)
+        for v in range(end + 1)
+    ]
+
+    seed = nearest_neighbour(costs)
+    best_order, best_cost = seed[1:-1], tour_cost(costs, seed)
+    if not math.isfinite(best_cost):
+        best_order = None
+    nodes = 0
+    tour = [0]
+    remaining = set(range(1, end))
+
+    def extend(cost: float, out_bound: float, in_bound: float) -> None:
+        nonlocal best_order, best_cost, nodes
+        nodes += 1
+        last = tour[-1]
+        if not remaining:
+            cost += costs[last][end]
+            if cost < best_cost:
+                best_order, best_cost = tour[1:], cost
+            return
+        if cost + max(out_bound, in_bound) >= best_cost:
+            return
+        row = costs[last]
+        for stop in sorted(remaining, key=lambda j: (row[j], j)):
+            if not math.isfinite(row[stop]):
+                break
+            tour.append(stop)
+            remaining.remove(stop)
+            extend(
+                cost + row[stop],
+                out_bound - cheapest_out[last],
+                in_bound - cheapest_in[stop],
+            )
+            remaining.add(stop)
+            tour.pop()
+
+    extend(0, sum(cheapest_out[:end]), sum(cheapest_in[1:]))
+    return Explored(best_order, best_cost, nodes)
+
+
+def lower_bound(costs: CostMatrix) -> float:
+    """Every stop after the start is entered once, at least as cheaply as
+    its cheapest incoming leg from a stop other than the end."""
+    end = len(costs) - 1
+    return sum(
+        min((costs[u][v] for u in range(end) if u != v), default=math.inf)
+        for v in range(1, end + 1)
+    )
+
+
+def held_karp(
+    costs: CostMatrix, deadline: float | None = None
+) -> list[int] | None:
+    """Exact visiting order, raising TimeoutError past the deadline."""
+    n = len(costs) - 2
+    if n < 1:
+        return [] if math.isfinite(costs[0][-1]) else None
+
+    # best[mask][j]: cheapest path from the start through every waypoint
+    # in mask, finishing at waypoint j (bit j of mask, matrix row j + 1).
+    best: list[list[float]] = [[]] * (1 << n)
+    parent: list[list[int]] = [[]] * (1 << n)
+    for mask in range(1, 1 << n):
+        if (
+            deadline is not None
+            and not mask & 0xFF
+            and time.perf_counter() > deadline
+        ):
+            raise TimeoutError
+        row, links = [math.inf] * n, [-1] * n
+        for j in bits(mask):
+            rest = mask ^ (1 << j)
+            if not rest:
+                row[j] = costs[0][j + 1]
+                continue
+            previous = best[rest]
+            for k in bits(rest):
+                cost = previous[k] + costs[k + 1][j + 1]
+                if cost < row[j]:
+                    row[j], links[j] = cost, k
+        best[mask], parent[mask] = row, links
+
+    full = (1 << n) - 1
+    last, total = -1, math.inf
+    for j in range(n):
+        cost = best[full][j] + costs[j + 1][-1]
+        if cost < total:
+            last, total = j, cost
+    if last < 0:
+        return None
+
+    order, mask = [], full
+    while last >= 0:
+        order.append(last + 1)
+        mask, last = mask ^ (1 << last), parent[mask][last]
+    return order[::-1]
+
+
+def nearest_neighbour(costs: CostMatrix) -> list[int]:
+    end = len(costs) - 1
+    tour, unvisited = [0], set(range(1, end))
+    while unvisited:
+        current = costs[tour[-1]]
+        tour.append(min(unvisited, key=lambda j: (current[j], j)))
+        unvisited.remove(tour[-1])
+    tour.append(end)
+    return tour
+
+
+def two_opt(costs: CostMatrix, tour: list[int]) -> bool:
+    """Apply the first improving segment reversal, if any."""
+    # Running leg costs in both directions make the reversed segment O(1)
+    # to evaluate even when the matrix is not symmetric.
+    forward, backward = [0.0], [0.0]
+    for u, v in zip(tour, tour[1:]):
+        forward.append(forward[-1] + costs[u][v])
+        backward.append(backward[-1] + costs[v][u])
+    for i in range(1, len(tour) - 2):
+        for j in range(i + 1, len(tour) - 1):
+            before = (
+                costs[tour[i - 1]][tour[i]]
+                + forward[j] - forward[i]
+                + costs[tour[j]][tour[j + 1]]
+            )
+            after = (
+                costs[tour[i - 1]][tour[j]]
+                + backward[j] - backward[i]
+                + costs[tour[i]][tour[j + 1]]
+            )
+            if after < before - 1e-9:
+                tour[i : j + 1] = tour[i : j + 1][::-1]
+                return True
+    return False
+
+
+def or_opt(costs: CostMatrix, tour: list[int]) -> bool:
+    """Move the first segment of up to three waypoints that pays off."""
+    for length in (1, 2, 3):
+        for i in range(1, len(tour) - length):
+            head, tail = tour[i], tour[i + length - 1]
+            prev, succ = tour[i - 1], tour[i + length]
+            gain = costs[prev][head] + costs[tail][succ] - costs[prev][succ]
+            rest = tour[:i] + tour[i + length :]
+            for p in range(len(rest) - 1):
+                if p == i - 1:
+                    continue
+                u, v = rest[p], rest[p + 1]
+                if costs[u][head] + costs[tail][v] - costs[u][v] < gain - 1e-9:
+                    tour[:] = rest[: p + 1] + tour[i : i + length] + rest[p + 1 :]
+                    return True
+    return False
+
+
+def bits(mask: int) -> list[int]:
+    return [i for i in range(mask.bit_length()) if mask >> i & 1]
+
+
+def tour_cost(costs: CostMatrix, tour: Sequence[int]) -> float:
+    return sum(costs[u][v] for u, v in zip(tour, tour[1:]))
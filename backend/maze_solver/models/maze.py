@@ -1,26 +1,37 @@
-from dataclasses import dataclass
+from dataclasses import InitVar, dataclass, field
 from functools import cached_property
+from operator import attrgetter
 from pathlib import Path
-from typing import Iterator
+from typing import Iterator, overload
+
+import numpy as np
 
 from maze_solver.models.role import Role
 from maze_solver.models.square import Square
-from maze_solver.persistence.serializer import dump_squares, load_squares
+from maze_solver.persistence.serializer import (
+    compress,
+    decode_square,
+    dump_squares,
+    load_squares,
+    map_squares,
+)
 
 
 @dataclass(frozen=True)
 class Maze:
     squares: tuple[Square, ...]
+    # Skips validation, for squares known to form a valid maze such as
+    # those of a file whose checksum matches an already validated one
+    trusted: InitVar[bool] = False
 
     @classmethod
-    def load(cls, path: Path) -> "Maze":
-        return Maze(tuple(load_squares(path)))
+    def load(cls, path: Path, trusted: bool = False) -> "Maze":
+        return Maze(tuple(load_squares(path)), trusted)
 
-    def __post_init__(self) -> None:
-        validate_indices(self)
-        validate_rows_columns(self)
-        validate_entrance(self)
-        validate_exit(self)
+    def __post_init__(self, trusted: bool) -> None:
+        if not trusted:
+            # Validating already finds what the cached properties hold
+            self.__dict__.update(validate(self.squares))
 
     def __iter__(self) -> Iterator[Square]:
         return iter(self.squares)
@@ -30,11 +41,11 @@ class Maze:
 
     @cached_property
     def width(self):
-        return max(square.column for square in self) + 1
+        return self.squares[-1].column + 1
 
     @cached_property
     def height(self):
-        return max(square.row for square in self) + 1
+        return self.squares[-1].row + 1
 
     @cached_property
     def entrance(self) -> Square:
@@ -44,31 +55,110 @@ class Maze:
     def exit(self) -> Square:
         return next(sq for sq in self if sq.role is Role.EXIT)
 
+    @cached_property
+    def values(self) -> bytes:
+        """Compressed square bytes, as stored in a .maze file."""
+        return bytes(map(compress, self.squares))
+
     def dump(self, path: Path) -> None:
         dump_squares(self.width, self.height, self.squares, path)
 
 
-def validate_indices(maze: Maze) -> None:
-    assert [square.index for square in maze] == list(
-        range(len(maze.squares))
-    ), "Wrong square.index"
+@dataclass(frozen=True)
+class MappedMaze:
+    """Maze over the bytes of a memory-mapped .maze file.
+
+    Squares are decoded from their byte on first access only, so large
+    layouts cost little more than the file itself and the squares in use.
+    """
+
+    width: int
+    height: int
+    values: memoryview | bytes
+    # Squares decoded so far, so that each index maps to a single instance
+    interned: dict[int, Square] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    @classmethod
+    def load(cls, path: Path) -> "MappedMaze":
+        header, body = map_squares(path)
+        return cls(header.width, header.height, body.square_values)
+
+    def __post_init__(self) -> None:
+        assert len(self.values) == self.width * self.height, "Wrong size"
+        roles = self.roles
+        assert np.count_nonzero(roles == Role.ENTRANCE) == 1, (
+            "Must be exactly one entrance"
+        )
+        assert np.count_nonzero(roles == Role.EXIT) == 1, (
+            "Must be exactly one exit"
+        )
+
+    def __len__(self) -> int:
+        return len(self.values)
 
+    def __iter__(self) -> Iterator[Square]:
+        return map(self.__getitem__, range(len(self)))
 
-def validate_rows_columns(maze: Maze) -> None:
-    for y in range(maze.height):
-        for x in range(maze.width):
-            square = maze[y * maze.width + x]
-            assert square.row == y, "Wrong square.row"
-            assert square.column == x, "Wrong square.column"
+    @overload
+    def __getitem__(self, index: int) -> Square: ...
 
+    @overload
+    def __getitem__(self, index: slice) -> tuple[Square, ...]: ...
 
-def validate_entrance(maze: Maze) -> None:
-    assert 1 == sum(
-        1 for square in maze if square.role is Role.ENTRANCE
-    ), "Must be exactly one entrance"
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return tuple(map(self.__getitem__, range(len(self))[index]))
+        index = range(len(self))[index]
+        if (square := self.interned.get(index)) is None:
+            square = decode_square(index, self.width, self.values[index])
+            self.interned[index] = square
+        return square
+
+    @property
+    def squares(self) -> tuple[Square, ...]:
+        return tuple(self)
+
+    @property
+    def roles(self) -> np.ndarray:
+        return np.frombuffer(self.values, dtype=np.uint8) >> 4
+
+    @cached_property
+    def entrance(self) -> Square:
+        return self[int(np.argmax(self.roles == Role.ENTRANCE))]
+
+    @cached_property
+    def exit(self) -> Square:
+        return self[int(np.argmax(self.roles == Role.EXIT))]
+
+    def dump(self, path: Path) -> None:
+        dump_squares(self.width, self.height, self.squares, path)
 
 
-def validate_exit(maze: Maze) -> None:
-    assert 1 == sum(
-        1 for square in maze if square.role is Role.EXIT
-    ), "Must be exactly one exit"
+def validate(squares: tuple[Square, ...]) -> dict:
+    """Check all maze invariants at once.
+
+    Returns the width, height, entrance and exit found along the way.
+    """
+    assert squares, "Maze must not be empty"
+    indices, rows, columns, roles = (
+        np.fromiter(map(attrgetter(name), squares), np.int64, len(squares))
+        for name in ("index", "row", "column", "role")
+    )
+    expected = np.arange(len(squares))
+    assert np.array_equal(indices, expected), "Wrong square.index"
+    width, height = columns.max() + 1, rows.max() + 1
+    assert width * height == len(squares), "Maze must be rectangular"
+    assert np.array_equal(rows, expected // width), "Wrong square.row"
+    assert np.array_equal(columns, expected % width), "Wrong square.column"
+    (entrances,) = np.nonzero(roles == Role.ENTRANCE)
+    assert len(entrances) == 1, "Must be exactly one entrance"
+    (exits,) = np.nonzero(roles == Role.EXIT)
+    assert len(exits) == 1, "Must be exactly one exit"
+    return {
+        "width": int(width),
+        "height": int(height),
+        "entrance": squares[entrances[0]],
+        "exit": squares[exits[0]],
+    }
@@ -10,6 +10,10 @@ from maze_solver.models.square import Square
 class Solution:
     squares: tuple[Square, ...]
     current: int
+    # Set by deadline-bound solving: whether the tour is proven optimal,
+    # and otherwise how far above optimal it may be
+    optimal: bool | None = None
+    gap: float | None = None
     
     def __iter__(self) -> Iterator[Square]:
         return iter(self.squares)
@@ -4,10 +4,15 @@ from maze_solver.models.border import Border
 from maze_solver.models.role import Role
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Square:
     index: int
     row: int
     column: int
     border: Border = Border.EMPTY
     role: Role = Role.NONE
+
+    def __hash__(self) -> int:
+        # Squares are graph nodes and set members, and each maze holds one
+        # instance per index, so hashing the index alone is enough
+        return hash(self.index)
@@ -1,9 +1,15 @@
 import array
+import mmap
 import struct
+import zlib
 from dataclasses import dataclass
-from typing import BinaryIO
+from typing import BinaryIO, Mapping
 
 MAGIC_NUMBER: bytes = b"MAZE"
+# Tag, offset from the start of the file, length and CRC-32 of a section
+SECTION = struct.Struct("<4sQQI")
+# Sections start on 8-byte boundaries so that float64 data can be cast
+ALIGNMENT: int = 8
 
 
 @dataclass(frozen=True)
@@ -29,11 +35,94 @@ class FileHeader:
 
 @dataclass(frozen=True)
 class FileBody:
-    square_values: array.array
+    square_values: array.array | memoryview
 
     @classmethod
     def read(cls, header: FileHeader, file: BinaryIO) -> "FileBody":
         return cls(array.array("B", file.read(header.width * header.height)))
 
+    @classmethod
+    def map(cls, header: FileHeader, file: BinaryIO) -> "FileBody":
+        """Map the square values read-only instead of copying them."""
+        start = file.tell()
+        end = start + header.width * header.height
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        assert len(buffer) >= end, "Truncated file"
+        return cls(memoryview(buffer)[start:end])
+
     def write(self, file: BinaryIO) -> None:
         file.write(self.square_values.tobytes())
+
+
+@dataclass(frozen=True)
+class Section:
+    tag: bytes
+    offset: int
+    length: int
+    checksum: int
+
+
+@dataclass(frozen=True)
+class SectionTable:
+    """Directory of the sections following the header of a v2 file."""
+
+    sections: tuple[Section, ...]
+
+    @classmethod
+    def read(cls, file: BinaryIO) -> "SectionTable":
+        (count,) = struct.unpack("<I", file.read(4))
+        return cls(
+            tuple(
+                Section(*SECTION.unpack(file.read(SECTION.size)))
+                for _ in range(count)
+            )
+        )
+
+    @classmethod
+    def layout(
+        cls, start: int, payloads: Mapping[bytes, bytes]
+    ) -> "SectionTable":
+        """Place the payloads one after another, past the table itself."""
+        offset = start + 4 + len(payloads) * SECTION.size
+        sections = []
+        for tag, payload in payloads.items():
+            offset += -offset % ALIGNMENT
+            sections.append(
+                Section(tag, offset, len(payload), zlib.crc32(payload))
+            )
+            offset += len(payload)
+        return cls(tuple(sections))
+
+    def write(self, file: BinaryIO) -> None:
+        file.write(struct.pack("<I", len(self.sections)))
+        for section in self.sections:
+            file.write(
+                SECTION.pack(
+                    section.tag,
+                    section.offset,
+                    section.length,
+                    section.checksum,
+                )
+            )
+
+    def write_payloads(
+        self, file: BinaryIO, payloads: Mapping[bytes, bytes]
+    ) -> None:
+        for section in self.sections:
+            file.write(b"\0" * (section.offset - file.tell()))
+            file.write(payloads[section.tag])
+
+    def map(self, file: BinaryIO) -> dict[bytes, memoryview]:
+        """Map every section read-only, verifying its checksum."""
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        views = {}
+        for section in self.sections:
+            view = memoryview(buffer)[
+                section.offset : section.offset + section.length
+            ]
+            assert len(view) == section.length, "Truncated file"
+            assert zlib.crc32(view) == section.checksum, (
+                f"Corrupted {section.tag.decode()} section"
+            )
+            views[section.tag] = view
+        return views
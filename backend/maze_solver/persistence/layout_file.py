@@ -0,0 +1,108 @@
+import argparse
+import array
+import hashlib
+import json
+import pathlib
+from dataclasses import dataclass
+
+from maze_solver.graphs.compact import CompactGraph
+from maze_solver.graphs.table import DistanceTable
+from maze_solver.models.maze import Maze
+from maze_solver.persistence.file_format import FileBody
+from maze_solver.persistence.serializer import (
+    SQUARES,
+    deserialize,
+    dump_sections,
+    load_sections,
+)
+from maze_solver.view.renderer import COUNTER_LABELS, Labels
+
+# Optional sections of a v2 .maze file next to the squares
+OFFSETS: bytes = b"OFFS"
+NEIGHBOURS: bytes = b"NBRS"
+WEIGHTS: bytes = b"WGHT"
+DISTANCES: bytes = b"DIST"
+LABELS: bytes = b"LBLS"
+
+
+@dataclass(frozen=True)
+class LayoutFile:
+    """Maze with the graph, distance table and labels precomputed for it."""
+
+    maze: Maze
+    compact: CompactGraph | None = None
+    table: DistanceTable | None = None
+    labels: Labels | None = None
+
+    @classmethod
+    def build(cls, maze: Maze, labels: Labels | None = None) -> "LayoutFile":
+        compact = CompactGraph.from_maze(maze)
+        return cls(maze, compact, DistanceTable.build(maze), labels)
+
+    @classmethod
+    def load(cls, path: pathlib.Path) -> "LayoutFile":
+        """Read a v2 file, wrapping its sections instead of rebuilding."""
+        header, sections = load_sections(path)
+        body = FileBody(array.array("B", sections[SQUARES]))
+        # Every section passed its checksum and was written from a
+        # validated maze
+        maze = Maze(tuple(deserialize(header, body)), trusted=True)
+        compact = table = labels = None
+        if {OFFSETS, NEIGHBOURS, WEIGHTS} <= sections.keys():
+            compact = CompactGraph(
+                header.width,
+                sections[OFFSETS].cast("i"),
+                sections[NEIGHBOURS].cast("i"),
+                sections[WEIGHTS].cast("d"),
+            )
+        if DISTANCES in sections:
+            table = DistanceTable.from_buffer(sections[DISTANCES])
+        if LABELS in sections:
+            labels = tuple(
+                (name, range(start, stop))
+                for name, (start, stop) in json.loads(bytes(sections[LABELS]))
+            )
+        return cls(maze, compact, table, labels)
+
+    def dump(self, path: pathlib.Path) -> None:
+        sections = {}
+        if (compact := self.compact) is not None:
+            sections[OFFSETS] = array.array("i", compact.offsets).tobytes()
+            neighbours = array.array("i", compact.neighbours)
+            sections[NEIGHBOURS] = neighbours.tobytes()
+            sections[WEIGHTS] = array.array("d", compact.weights).tobytes()
+        if self.table is not None:
+            sections[DISTANCES] = self.table.to_bytes()
+        if self.labels is not None:
+            sections[LABELS] = json.dumps(
+                [[name, [span.start, span.stop]] for name, span in self.labels]
+            ).encode()
+        dump_sections(
+            self.maze.width,
+            self.maze.height,
+            self.maze.squares,
+            sections,
+            path,
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Convert a .maze file to v2 with precomputed sections"
+    )
+    parser.add_argument("source", type=pathlib.Path)
+    parser.add_argument("target", type=pathlib.Path)
+    parser.add_argument(
+        "--store-labels",
+        action="store_true",
+        help="embed the counter labels of the store layout",
+    )
+    args = parser.parse_args()
+    labels = COUNTER_LABELS if args.store_labels else None
+    LayoutFile.build(Maze.load(args.source), labels).dump(args.target)
+    digest = hashlib.sha256(args.target.read_bytes()).hexdigest()
+    print(f"{args.target}: {args.target.stat().st_size} bytes, {digest[:16]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import hashlib
+import pathlib
+import threading
+from dataclasses import dataclass, replace
+from functools import cached_property
+
+import networkx as nx
+
+from maze_solver.graphs.compact import CompactGraph
+from maze_solver.graphs.converter import make_graph
+from maze_solver.graphs.table import DistanceTable, table_path
+from maze_solver.models.maze import Maze
+from maze_solver.persistence.layout_file import LayoutFile
+from maze_solver.persistence.serializer import (
+    SECTIONS_FORMAT_VERSION,
+    read_format_version,
+)
+from maze_solver.view.renderer import Labels
+
+
+@dataclass(frozen=True)
+class Layout:
+    path: pathlib.Path
+    mtime_ns: int
+    digest: bytes
+    maze: Maze
+    compact: CompactGraph
+    table: DistanceTable
+    # None unless the layout file carries its own labels section
+    labels: Labels | None = None
+
+    @property
+    def version(self) -> str:
+        return self.digest.hex()[:16]
+
+    @cached_property
+    def graph(self) -> nx.DiGraph:
+        return make_graph(self.maze)
+
+
+class LayoutRegistry:
+    """Loads every .maze layout once per process and reuses it until the
+    file changes on disk.
+
+    Distance tables for v1 files are cached next to each layout, or in
+    table_dir when it is set.
+    """
+
+    def __init__(self, table_dir: pathlib.Path | None = None) -> None:
+        self.table_dir = table_dir
+        self._layouts: dict[pathlib.Path, Layout] = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: pathlib.Path) -> Layout:
+        path = pathlib.Path(path).resolve()
+        mtime_ns = path.stat().st_mtime_ns
+        layout = self._layouts.get(path)
+        if layout is not None and layout.mtime_ns == mtime_ns:
+            return layout
+        with self._lock:
+            layout = self._layouts.get(path)
+            if layout is None or layout.mtime_ns != mtime_ns:
+                layout = self._refresh(path, mtime_ns, layout)
+                self._layouts[path] = layout
+            return layout
+
+    def clear(self) -> None:
+        with self._lock:
+            self._layouts.clear()
+
+    def _refresh(
+        self, path: pathlib.Path, mtime_ns: int, layout: Layout | None
+    ) -> Layout:
+        digest = hashlib.sha256(path.read_bytes()).digest()
+        if layout is not None and layout.digest == digest:
+            # Touched but unchanged, so keep the layout we already have
+            return replace(layout, mtime_ns=mtime_ns)
+        if read_format_version(path) == SECTIONS_FORMAT_VERSION:
+            # Precomputed sections replace building the graph and table
+            layout_file = LayoutFile.load(path)
+            maze = layout_file.maze
+            return Layout(
+                path,
+                mtime_ns,
+                digest,
+                maze,
+                layout_file.compact or CompactGraph.from_maze(maze),
+                layout_file.table or DistanceTable.build(maze, digest),
+                layout_file.labels,
+            )
+        table = DistanceTable.load_or_build(
+            path, table_path(path, self.table_dir)
+        )
+        # A table with our digest was built from a validated copy of these
+        # exact bytes, so the maze needs no second validation
+        maze = Maze.load(path, trusted=table.digest == digest)
+        return Layout(
+            path,
+            mtime_ns,
+            digest,
+            maze,
+            CompactGraph.from_maze(maze),
+            table,
+        )
+
+
+layouts = LayoutRegistry()
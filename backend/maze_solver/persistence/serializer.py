@@ -1,13 +1,20 @@
 import array
 import pathlib
-from typing import Iterator
+from typing import BinaryIO, Iterator
 
 from maze_solver.models.border import Border
 from maze_solver.models.role import Role
 from maze_solver.models.square import Square
-from maze_solver.persistence.file_format import FileBody, FileHeader
+from maze_solver.persistence.file_format import (
+    FileBody,
+    FileHeader,
+    SectionTable,
+)
 
 FORMAT_VERSION: int = 1
+# Header followed by a table of checksummed sections, squares included
+SECTIONS_FORMAT_VERSION: int = 2
+SQUARES: bytes = b"SQRS"
 
 
 def dump_squares(
@@ -22,15 +29,66 @@ def dump_squares(
         body.write(file)
 
 
+def dump_sections(
+    width: int,
+    height: int,
+    squares: tuple[Square, ...],
+    sections: dict[bytes, bytes],
+    path: pathlib.Path,
+) -> None:
+    header = FileHeader(SECTIONS_FORMAT_VERSION, width, height)
+    _, body = serialize(width, height, squares)
+    payloads = {SQUARES: body.square_values.tobytes(), **sections}
+    with path.open(mode="wb") as file:
+        header.write(file)
+        table = SectionTable.layout(file.tell(), payloads)
+        table.write(file)
+        table.write_payloads(file, payloads)
+
+
 def load_squares(path: pathlib.Path) -> Iterator[Square]:
     with path.open("rb") as file:
-        header = FileHeader.read(file)
-        if header.format_version != FORMAT_VERSION:
-            raise ValueError("Unsupported file format version")
-        body = FileBody.read(header, file)
+        header = read_header(file)
+        if header.format_version == SECTIONS_FORMAT_VERSION:
+            values = SectionTable.read(file).map(file)[SQUARES]
+            body = FileBody(array.array("B", values))
+        else:
+            body = FileBody.read(header, file)
         return deserialize(header, body)
 
 
+def map_squares(path: pathlib.Path) -> tuple[FileHeader, FileBody]:
+    with path.open("rb") as file:
+        header = read_header(file)
+        if header.format_version == SECTIONS_FORMAT_VERSION:
+            values = SectionTable.read(file).map(file)[SQUARES]
+            return header, FileBody(values)
+        return header, FileBody.map(header, file)
+
+
+def load_sections(
+    path: pathlib.Path,
+) -> tuple[FileHeader, dict[bytes, memoryview]]:
+    """Return the header and the mapped sections of a v2 file."""
+    with path.open("rb") as file:
+        header = read_header(file)
+        if header.format_version != SECTIONS_FORMAT_VERSION:
+            raise ValueError("File has no sections")
+        return header, SectionTable.read(file).map(file)
+
+
+def read_format_version(path: pathlib.Path) -> int:
+    with path.open("rb") as file:
+        return FileHeader.read(file).format_version
+
+
+def read_header(file: BinaryIO) -> FileHeader:
+    header = FileHeader.read(file)
+    if header.format_version not in (FORMAT_VERSION, SECTIONS_FORMAT_VERSION):
+        raise ValueError("Unsupported file format version")
+    return header
+
+
 def serialize(
     width: int, height: int, squares: tuple[Square, ...]
 ) -> tuple[FileHeader, FileBody]:
@@ -41,9 +99,13 @@ def serialize(
 
 def deserialize(header: FileHeader, body: FileBody) -> Iterator[Square]:
     for index, square_value in enumerate(body.square_values):
-        row, column = divmod(index, header.width)
-        border, role = decompress(square_value)
-        yield Square(index, row, column, border, role)
+        yield decode_square(index, header.width, square_value)
+
+
+def decode_square(index: int, width: int, square_value: int) -> Square:
+    row, column = divmod(index, width)
+    border, role = decompress(square_value)
+    return Square(index, row, column, border, role)
 
 
 def compress(square: Square) -> int:
@@ -1,3 +1,5 @@
+from typing import Callable, Sequence
+
 from maze_solver.models.border import Border
 from maze_solver.view.primitives import (
     DisjointLines,
@@ -9,119 +11,82 @@ from maze_solver.view.primitives import (
     Primitive,
 )
 
+# Square corners as offsets in units of the square size
+TOP_LEFT = (0, 0)
+TOP_RIGHT = (1, 0)
+BOTTOM_RIGHT = (1, 1)
+BOTTOM_LEFT = (0, 1)
 
-def decompose(border: Border, top_left: Point, square_size: int) -> Primitive:
-    top_right: Point = top_left.translate(x=square_size)
-    bottom_right: Point = top_left.translate(x=square_size, y=square_size)
-    bottom_left: Point = top_left.translate(y=square_size)
-
-    top = Line(top_left, top_right)
-    bottom = Line(bottom_left, bottom_right)
-    left = Line(top_left, bottom_left)
-    right = Line(top_right, bottom_right)
-
-    if border is Border.LEFT | Border.TOP | Border.RIGHT | Border.BOTTOM:
-        return Polygon(
-            [
-                top_left,
-                top_right,
-                bottom_right,
-                bottom_left,
-            ]
-        )
-
-    if border is Border.BOTTOM | Border.LEFT | Border.TOP:
-        return Polyline(
-            [
-                bottom_right,
-                bottom_left,
-                top_left,
-                top_right,
-            ]
-        )
-
-    if border is Border.LEFT | Border.TOP | Border.RIGHT:
-        return Polyline(
-            [
-                bottom_left,
-                top_left,
-                top_right,
-                bottom_right,
-            ]
-        )
+Builder = Callable[[Sequence[Point]], Primitive]
 
-    if border is Border.TOP | Border.RIGHT | Border.BOTTOM:
-        return Polyline(
-            [
-                top_left,
-                top_right,
-                bottom_right,
-                bottom_left,
-            ]
-        )
 
-    if border is Border.RIGHT | Border.BOTTOM | Border.LEFT:
-        return Polyline(
-            [
-                top_right,
-                bottom_right,
-                bottom_left,
-                top_left,
-            ]
-        )
+def line(points: Sequence[Point]) -> Line:
+    return Line(*points)
 
-    if border is Border.LEFT | Border.TOP:
-        return Polyline(
-            [
-                bottom_left,
-                top_left,
-                top_right,
-            ]
-        )
 
-    if border is Border.TOP | Border.RIGHT:
-        return Polyline(
-            [
-                top_left,
-                top_right,
-                bottom_right,
-            ]
-        )
+def disjoint_lines(points: Sequence[Point]) -> DisjointLines:
+    return DisjointLines([Line(*points[:2]), Line(*points[2:])])
 
-    if border is Border.BOTTOM | Border.LEFT:
-        return Polyline(
-            [
-                bottom_right,
-                bottom_left,
-                top_left,
-            ]
-        )
 
-    if border is Border.RIGHT | Border.BOTTOM:
-        return Polyline(
-            [
-                top_right,
-                bottom_right,
-                bottom_left,
-            ]
-        )
-
-    if border is Border.LEFT | Border.RIGHT:
-        return DisjointLines([left, right])
-
-    if border is Border.TOP | Border.BOTTOM:
-        return DisjointLines([top, bottom])
-
-    if border is Border.TOP:
-        return top
+def null(points: Sequence[Point]) -> NullPrimitive:
+    return NullPrimitive()
 
-    if border is Border.RIGHT:
-        return right
 
-    if border is Border.BOTTOM:
-        return bottom
+OUTLINES: dict[Border, tuple[Builder, tuple[tuple[int, int], ...]]] = {
+    Border.LEFT | Border.TOP | Border.RIGHT | Border.BOTTOM: (
+        Polygon,
+        (TOP_LEFT, TOP_RIGHT, BOTTOM_RIGHT, BOTTOM_LEFT),
+    ),
+    Border.BOTTOM | Border.LEFT | Border.TOP: (
+        Polyline,
+        (BOTTOM_RIGHT, BOTTOM_LEFT, TOP_LEFT, TOP_RIGHT),
+    ),
+    Border.LEFT | Border.TOP | Border.RIGHT: (
+        Polyline,
+        (BOTTOM_LEFT, TOP_LEFT, TOP_RIGHT, BOTTOM_RIGHT),
+    ),
+    Border.TOP | Border.RIGHT | Border.BOTTOM: (
+        Polyline,
+        (TOP_LEFT, TOP_RIGHT, BOTTOM_RIGHT, BOTTOM_LEFT),
+    ),
+    Border.RIGHT | Border.BOTTOM | Border.LEFT: (
+        Polyline,
+        (TOP_RIGHT, BOTTOM_RIGHT, BOTTOM_LEFT, TOP_LEFT),
+    ),
+    Border.LEFT | Border.TOP: (Polyline, (BOTTOM_LEFT, TOP_LEFT, TOP_RIGHT)),
+    Border.TOP | Border.RIGHT: (Polyline, (TOP_LEFT, TOP_RIGHT, BOTTOM_RIGHT)),
+    Border.BOTTOM | Border.LEFT: (
+        Polyline,
+        (BOTTOM_RIGHT, BOTTOM_LEFT, TOP_LEFT),
+    ),
+    Border.RIGHT | Border.BOTTOM: (
+        Polyline,
+        (TOP_RIGHT, BOTTOM_RIGHT, BOTTOM_LEFT),
+    ),
+    Border.LEFT | Border.RIGHT: (
+        disjoint_lines,
+        (TOP_LEFT, BOTTOM_LEFT, TOP_RIGHT, BOTTOM_RIGHT),
+    ),
+    Border.TOP | Border.BOTTOM: (
+        disjoint_lines,
+        (TOP_LEFT, TOP_RIGHT, BOTTOM_LEFT, BOTTOM_RIGHT),
+    ),
+    Border.TOP: (line, (TOP_LEFT, TOP_RIGHT)),
+    Border.RIGHT: (line, (TOP_RIGHT, BOTTOM_RIGHT)),
+    Border.BOTTOM: (line, (BOTTOM_LEFT, BOTTOM_RIGHT)),
+    Border.LEFT: (line, (TOP_LEFT, BOTTOM_LEFT)),
+}
+
+# Indexed by the 4-bit border value, so decomposing is a single lookup
+TABLE = tuple(OUTLINES.get(Border(value), (null, ())) for value in range(16))
 
-    if border is Border.LEFT:
-        return left
 
-    return NullPrimitive()
+def decompose(border: Border, top_left: Point, square_size: int) -> Primitive:
+    build, corners = TABLE[border]
+    x, y = top_left
+    return build(
+        [
+            Point(x + dx * square_size, y + dy * square_size)
+            for dx, dy in corners
+        ]
+    )
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import NamedTuple, Protocol
+from typing import Iterable, Iterator, NamedTuple, Protocol
 
 
 class Primitive(Protocol):
@@ -39,19 +39,26 @@ class Line(NamedTuple):
 
 class Polyline(tuple[Point, ...]):
     def draw(self, **attributes) -> str:
-        points = " ".join(point.draw() for point in self)
-        return tag("polyline", points=points, **attributes)
+        return "".join(self.chunks(**attributes))
+
+    def chunks(self, **attributes) -> Iterator[str]:
+        return points_tag_chunks("polyline", self, **attributes)
 
 
 class Polygon(tuple[Point, ...]):
     def draw(self, **attributes) -> str:
-        points = " ".join(point.draw() for point in self)
-        return tag("polygon", points=points, **attributes)
+        return "".join(self.chunks(**attributes))
+
+    def chunks(self, **attributes) -> Iterator[str]:
+        return points_tag_chunks("polygon", self, **attributes)
 
 
 class DisjointLines(tuple[Line, ...]):
     def draw(self, **attributes) -> str:
-        return "".join(line.draw(**attributes) for line in self)
+        return "".join(self.chunks(**attributes))
+
+    def chunks(self, **attributes) -> Iterator[str]:
+        return (line.draw(**attributes) for line in self)
 
 
 @dataclass(frozen=True)
@@ -78,7 +85,56 @@ class Text:
 
 
 def tag(name: str, value: str | None = None, **attributes) -> str:
-    attrs = (
+    attrs = format_attributes(attributes)
+    if value is None:
+        return f"<{name}{attrs} />"
+    return f"<{name}{attrs}>{value}</{name}>"
+
+
+def tag_chunks(
+    name: str, value: Iterable[str] | None = None, **attributes
+) -> Iterator[str]:
+    """Like tag(), but yields the element piece by piece."""
+    attrs = format_attributes(attributes)
+    if value is None:
+        yield f"<{name}{attrs} />"
+        return
+    yield f"<{name}{attrs}>"
+    yield from value
+    yield f"</{name}>"
+
+
+def points_tag_chunks(
+    name: str, points: Iterable[Point], **attributes
+) -> Iterator[str]:
+    yield f'<{name} points="'
+    for i, point in enumerate(points):
+        yield f" {point.draw()}" if i else point.draw()
+    yield f'"{format_attributes(attributes)} />'
+
+
+def buffered(chunks: Iterable[str], size: int = 8192) -> Iterator[str]:
+    """Coalesce small chunks into pieces of at least size characters."""
+    buffer, length = [], 0
+    for chunk in chunks:
+        if len(chunk) >= size:
+            # Pass large chunks through instead of copying them
+            if buffer:
+                yield "".join(buffer)
+                buffer, length = [], 0
+            yield chunk
+            continue
+        buffer.append(chunk)
+        length += len(chunk)
+        if length >= size:
+            yield "".join(buffer)
+            buffer, length = [], 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def format_attributes(attributes: dict) -> str:
+    return (
         ""
         if not attributes
         else " "
@@ -87,6 +143,3 @@ def tag(name: str, value: str | None = None, **attributes) -> str:
             for key, value in attributes.items()
         )
     )
-    if value is None:
-        return f"<{name}{attrs} />"
-    return f"<{name}{attrs}>{value}</{name}>"
@@ -1,16 +1,24 @@
 import tempfile
 import textwrap
+import weakref
 import webbrowser
 from dataclasses import dataclass
+from typing import Iterable, Iterator, TextIO
 
-from functools import partial
-
-from maze_solver.models.maze import Maze
+from maze_solver.models.maze import MappedMaze, Maze
 from maze_solver.models.role import Role
 from maze_solver.models.solution import Solution
 from maze_solver.models.square import Square
-from maze_solver.view.decomposer import decompose
-from maze_solver.view.primitives import Point, Polyline, Rect, Text, tag
+from maze_solver.view.primitives import (
+    Point,
+    Polyline,
+    Rect,
+    Text,
+    buffered,
+    tag,
+    tag_chunks,
+)
+from maze_solver.view.simplifier import border_path
 
 ROLE_EMOJI = {
     # Role.ENTRANCE: "\N{pedestrian}",
@@ -19,6 +27,49 @@ ROLE_EMOJI = {
     Role.REWARD: "\N{white medium star}",
 }
 
+Labels = tuple[tuple[str, range], ...]
+
+# Counters of the store layout and the squares they span
+COUNTER_LABELS: Labels = (
+    ("frozen food", range(18, 24)),
+    ("meat", range(27, 33)),
+    ("spices", range(52, 59)),
+    ("dairy", range(60, 67)),
+    ("pulses & grains", range(89, 98)),
+    ("canned", range(123, 127)),
+    ("packaged", range(128, 132)),
+    ("beverages", range(157, 161)),
+    ("snacks", range(162, 166)),
+    ("fruits & vegetables", range(191, 200)),
+    ("household", range(222, 229)),
+    ("stationary", range(230, 237)),
+    ("electronics", range(257, 263)),
+    ("footwear", range(264, 270)),
+    ("men cloth", range(290, 294)),
+    ("kids cloth", range(295, 300)),
+    ("women cloth", range(301, 305)),
+)
+
+# Static layer per (renderer type, maze, square size, line width, labels),
+# dropped once the maze itself is garbage collected
+STATIC_LAYERS: dict[tuple, tuple[weakref.ref, str]] = {}
+
+
+HTML_TEMPLATE = textwrap.dedent(
+    """\
+    <!DOCTYPE html>
+    <html lang="en">
+    <head>
+      <meta charset="utf-8">
+      <meta name="viewport" content="width=device-width, initial-scale=1">
+      <title>SVG Preview</title>
+    </head>
+    <body>
+    {0}
+    </body>
+    </html>"""
+)
+
 
 @dataclass(frozen=True)
 class SVG:
@@ -26,46 +77,36 @@ class SVG:
 
     @property
     def html_content(self) -> str:
-        return textwrap.dedent(
-            """\
-        <!DOCTYPE html>
-        <html lang="en">
-        <head>
-          <meta charset="utf-8">
-          <meta name="viewport" content="width=device-width, initial-scale=1">
-          <title>SVG Preview</title>
-        </head>
-        <body>
-        {0}
-        </body>
-        </html>"""
-        ).format(self.xml_content)
+        return HTML_TEMPLATE.format(self.xml_content)
 
     def preview(self) -> None:
-        with tempfile.NamedTemporaryFile(
-            mode="w", encoding="utf-8", suffix=".html", delete=False
-        ) as file:
-            file.write(self.html_content)
-        webbrowser.open(f"file://{file.name}")
+        preview([self.xml_content])
 
 
 @dataclass(frozen=True)
 class SVGRenderer:
     square_size: int = 100
     line_width: int = 6
+    labels: Labels = COUNTER_LABELS
 
     @property
     def offset(self):
         return self.line_width // 2
 
     def render(self, maze: Maze, solution: Solution | None = None) -> SVG:
+        return SVG("".join(self.chunks(maze, solution)))
+
+    def chunks(
+        self, maze: Maze, solution: Solution | None = None
+    ) -> Iterator[str]:
+        """Yield the SVG document piece by piece instead of as one string."""
         margins = 2 * (self.offset + self.line_width)
         width = margins + maze.width * self.square_size
         height = margins + maze.height * self.square_size
-        return SVG(
-            tag(
+        return buffered(
+            tag_chunks(
                 "svg",
-                self._get_body(maze, solution),
+                self._iter_body(maze, solution),
                 xmlns="http://www.w3.org/2000/svg",
                 stroke_linejoin="round",
                 width=width,
@@ -74,6 +115,14 @@ class SVGRenderer:
             )
         )
 
+    def write(
+        self, sink: TextIO, maze: Maze, solution: Solution | None = None
+    ) -> None:
+        sink.writelines(self.chunks(maze, solution))
+
+    def preview(self, maze: Maze, solution: Solution | None = None) -> None:
+        preview(self.chunks(maze, solution))
+
     def _draw_counter_label(self, name: str, squares: list[Square], square_size: int, offset: int) -> str:
         # Compute center of label by averaging positions
         avg_col = sum(sq.column for sq in squares) / len(squares)
@@ -92,48 +141,55 @@ class SVGRenderer:
         )
 
     def _get_body(self, maze: Maze, solution: Solution | None) -> str:
-        counter_labels = {
-            "frozen food": maze[18:24],
-            "meat": maze[27:33],
-            "spices": maze[52:59],
-            "dairy": maze[60:67],
-            "pulses & grains": maze[89:98],
-            "canned": maze[123:127],
-            "packaged": maze[128:132],
-            "beverages": maze[157:161],
-            "snacks": maze[162:166],
-            "fruits & vegetables": maze[191:200],
-            "household": maze[222: 229],
-            "stationary": maze[230: 237],
-            "electronics": maze[257: 263],
-            "footwear": maze[264: 270],
-            "men cloth": maze[290: 294],
-            "kids cloth": maze[295: 300],
-            "women cloth": maze[301: 305]
-        }
-
-        return "".join(
+        return "".join(self._iter_body(maze, solution))
+
+    def _iter_body(
+        self, maze: Maze, solution: Solution | None
+    ) -> Iterator[str]:
+        yield self._get_static_layer(maze)
+        if solution:
+            yield from self._iter_overlay(maze, solution)
+
+    def _get_static_layer(self, maze: Maze) -> str:
+        """Walls, borders and labels, rendered once per layout and size."""
+        key = (
+            type(self), id(maze), self.square_size, self.line_width, self.labels
+        )
+        if (cached := STATIC_LAYERS.get(key)) and cached[0]() is maze:
+            return cached[1]
+
+        layer = "".join(
             [
                 arrow_marker(),
                 background(),
-                *map(partial(self._draw_square, start=solution.squares[0], current=solution.current), maze),
-                Text("🟩", self._transform(maze[solution.current]).translate(
-                    x=self.square_size // 2,
-                    y=self.square_size // 2 + 8
-                )).draw(
-                    fill = "green",
-                    font_size=f"{int(self.square_size)}px",
-                    text_anchor="middle",
-                    dominant_baseline="middle"
-                ),
-                *[self._draw_counter_label(name, squares, self.square_size, self.offset)
-                for name, squares in counter_labels.items()],
-                self._draw_solution(solution) if solution else ""
+                *map(self._draw_square, drawn_squares(maze)),
+                self._draw_borders(maze),
+                *[self._draw_counter_label(name, maze[span.start:span.stop], self.square_size, self.offset)
+                for name, span in self.labels],
             ]
         )
+        reference = weakref.ref(maze, lambda _: STATIC_LAYERS.pop(key, None))
+        STATIC_LAYERS[key] = (reference, layer)
+        return layer
 
+    def _iter_overlay(self, maze: Maze, solution: Solution) -> Iterator[str]:
+        """Markers and the route polyline drawn over the static layer."""
+        start = self._transform(solution.squares[0])
+        current = self._transform(maze[solution.current])
+        yield label("\N{pedestrian}", start, self.square_size // 2)
+        yield label("\N{white medium star}", current, self.square_size // 2)
+        yield Text("🟩", current.translate(
+            x=self.square_size // 2,
+            y=self.square_size // 2 + 8
+        )).draw(
+            fill = "green",
+            font_size=f"{int(self.square_size)}px",
+            text_anchor="middle",
+            dominant_baseline="middle"
+        )
+        yield from self._solution_chunks(solution)
 
-    def _draw_square(self, square: Square, start, current) -> str:
+    def _draw_square(self, square: Square) -> str:
         top_left: Point = self._transform(square)
         tags = []
         if square.role is Role.EXTERIOR:
@@ -142,27 +198,33 @@ class SVGRenderer:
             tags.append(wall(top_left, self.square_size, self.line_width))
         elif emoji := ROLE_EMOJI.get(square.role):
             tags.append(label(emoji, top_left, self.square_size // 2))
-        elif square == start:
-            emoji = "\N{pedestrian}"
-            tags.append(label(emoji, top_left, self.square_size // 2))
-        if square.index == current:
-            emoji = "\N{white medium star}"
-            tags.append(label(emoji, top_left, self.square_size // 2))
-        tags.append(self._draw_border(square, top_left))
         return "".join(tags)
 
-    def _draw_border(self, square: Square, top_left: Point) -> str:
-        return decompose(square.border, top_left, self.square_size).draw(
-            stroke_width=self.line_width, stroke="black", fill="none"
+    def _draw_borders(self, maze: Maze) -> str:
+        """All borders as one path of maximal wall segments."""
+        # Round caps stand in for the round joins the per-square polylines
+        # had, since corners are now where two separate segments meet.
+        return tag(
+            "path",
+            d=border_path(
+                maze.values, maze.width, self.square_size, self.offset
+            ),
+            stroke_width=self.line_width,
+            stroke_linecap="round",
+            stroke="black",
+            fill="none",
         )
 
     def _draw_solution(self, solution: Solution) -> str:
+        return "".join(self._solution_chunks(solution))
+
+    def _solution_chunks(self, solution: Solution) -> Iterator[str]:
         return Polyline(
             [
                 self._transform(point, self.square_size // 2)
                 for point in solution
             ]
-        ).draw(
+        ).chunks(
             stroke_width=self.line_width * 2,
             stroke_opacity="50%",
             stroke="red",
@@ -177,6 +239,25 @@ class SVGRenderer:
         ).translate(x=self.offset + extra_offset, y=self.offset + extra_offset)
 
 
+def drawn_squares(maze: Maze | MappedMaze) -> Iterator[Square]:
+    """Squares with a role, the only ones drawn apart from their borders."""
+    # Decoding only these keeps lazily loaded mazes from materializing
+    # every square
+    return (maze[i] for i, value in enumerate(maze.values) if value >> 4)
+
+
+def preview(chunks: Iterable[str]) -> None:
+    """Write an HTML page around the SVG chunks and open it in a browser."""
+    head, tail = HTML_TEMPLATE.split("{0}")
+    with tempfile.NamedTemporaryFile(
+        mode="w", encoding="utf-8", suffix=".html", delete=False
+    ) as file:
+        file.write(head)
+        file.writelines(chunks)
+        file.write(tail)
+    webbrowser.open(f"file://{file.name}")
+
+
 def arrow_marker() -> str:
     return tag(
         "defs",
@@ -1,5 +1,7 @@
 from dataclasses import dataclass
+from typing import Iterator
 
+from maze_solver.graphs.compact import CompactGraph
 from maze_solver.graphs.converter import get_edges, get_nodes
 from maze_solver.models.maze import Maze
 from maze_solver.models.role import Role
@@ -28,8 +30,11 @@ class ExtendedSVGRenderer(SVGRenderer):
     show_nodes: bool = True
     show_edges: bool = True
     include_corners: bool = True
+    graph: CompactGraph | None = None
 
-    def _get_body(self, maze: Maze, solution: Solution | None) -> str:
+    def _iter_body(
+        self, maze: Maze, solution: Solution | None
+    ) -> Iterator[str]:
         tags = [
             arrow_marker(),
             background(),
@@ -41,13 +46,14 @@ class ExtendedSVGRenderer(SVGRenderer):
         if self.show_obstacles:
             tags.append(self._render_obstacles(maze))
 
-        for square in maze:
-            top_left = self._transform(square)
-            if self.show_roles:
+        if self.show_roles:
+            for square in maze:
                 if square.role and (emoji := ROLE_EMOJI.get(square.role)):
+                    top_left = self._transform(square)
                     tags.append(label(emoji, top_left, self.square_size // 2))
-            if self.show_borders:
-                tags.append(self._draw_border(square, top_left))
+
+        if self.show_borders:
+            tags.append(self._draw_borders(maze))
 
         if self.show_nodes or self.show_edges:
             tags.append(self._render_nodes_edges(maze))
@@ -55,7 +61,7 @@ class ExtendedSVGRenderer(SVGRenderer):
         if self.show_solution and solution:
             tags.append(self._draw_solution(solution))
 
-        return "".join(tags)
+        return iter(tags)
 
     def _render_grid(self, maze: Maze) -> str:
         horizontal_lines = []
@@ -89,7 +95,10 @@ class ExtendedSVGRenderer(SVGRenderer):
     def _render_nodes_edges(self, maze: Maze) -> str:
         tags = []
 
-        nodes = get_nodes(maze)
+        if self.graph is not None:
+            nodes = [maze[index] for index in self.graph.nodes]
+        else:
+            nodes = get_nodes(maze)
 
         if self.show_nodes:
             for node in nodes:
@@ -105,11 +114,18 @@ class ExtendedSVGRenderer(SVGRenderer):
                 )
 
         if self.show_edges:
-            edges = get_edges(maze, nodes)
-            for edge in edges:
+            if self.graph is not None:
+                edges = [
+                    (maze[source], maze[target])
+                    for source, target, _ in self.graph.edges()
+                    if source < target
+                ]
+            else:
+                edges = get_edges(maze, nodes)
+            for node1, node2 in edges:
                 point1, point2 = [
                     self._transform(node, extra_offset=self.square_size // 2)
-                    for node in [edge.node1, edge.node2]
+                    for node in [node1, node2]
                 ]
                 tags.append(
                     Line(point1, point2).draw(
@@ -0,0 +1,77 @@
+from collections import defaultdict
+from typing import Iterator, Sequence
+
+from maze_solver.models.border import Border
+
+# Unit-length border pieces on the grid lines: (line, start) pairs, where
+# a horizontal piece on line y spans x = start..start + 1 and a vertical
+# piece on line x spans y = start..start + 1.
+Pieces = set[tuple[int, int]]
+
+
+# For each of the 16 borders, the grid lines of its pieces relative to the
+# square: rows of the horizontal ones and columns of the vertical ones.
+PIECES: tuple[tuple[tuple[int, ...], tuple[int, ...]], ...] = tuple(
+    (
+        tuple(y for y, flag in enumerate([Border.TOP, Border.BOTTOM])
+              if border & flag),
+        tuple(x for x, flag in enumerate([Border.LEFT, Border.RIGHT])
+              if border & flag),
+    )
+    for border in map(Border, range(16))
+)
+
+
+def border_pieces(
+    values: Sequence[int], width: int
+) -> tuple[Pieces, Pieces]:
+    """Collect every square's border once, sharing the common edges.
+
+    The values are the compressed square bytes of the .maze file format,
+    whose low nibble holds the border.
+    """
+    horizontal: Pieces = set()
+    vertical: Pieces = set()
+    for index, value in enumerate(values):
+        row, column = divmod(index, width)
+        rows, columns = PIECES[value & 0xF]
+        for offset in rows:
+            horizontal.add((row + offset, column))
+        for offset in columns:
+            vertical.add((column + offset, row))
+    return horizontal, vertical
+
+
+def merge_runs(pieces: Pieces) -> Iterator[tuple[int, int, int]]:
+    """Yield (line, start, end) for every maximal run of collinear pieces."""
+    lines: dict[int, list[int]] = defaultdict(list)
+    for line, start in pieces:
+        lines[line].append(start)
+    for line in sorted(lines):
+        starts = sorted(lines[line])
+        first = previous = starts[0]
+        for start in starts[1:]:
+            if start != previous + 1:
+                yield line, first, previous + 1
+                first = start
+            previous = start
+        yield line, first, previous + 1
+
+
+def border_path(
+    values: Sequence[int], width: int, square_size: int, offset: int
+) -> str:
+    """Return path data drawing all borders as maximal straight segments."""
+    horizontal, vertical = border_pieces(values, width)
+    commands = []
+    for y, start, end in merge_runs(horizontal):
+        commands.append(
+            f"M{start * square_size + offset},{y * square_size + offset}"
+            f"H{end * square_size + offset}"
+        )
+    for x, start, end in merge_runs(vertical):
+        commands.append(
+            f"M{x * square_size + offset},{start * square_size + offset}"
+            f"V{end * square_size + offset}"
+        )
+    return "".join(commands)
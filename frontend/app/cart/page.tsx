@@ -24,6 +24,7 @@ export default function CartPage() {
     try {
       const response = await fetch("http://localhost:8000/api/generate-path/", {
         method: "POST",
+        credentials: "include",
         headers: {
           "Content-Type": "application/json",
         },
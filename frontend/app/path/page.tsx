@@ -1,25 +1,105 @@
-import Image from "next/image"
+"use client"
+
+import Link from "next/link"
+import { MapPin } from "lucide-react"
+import { Button } from "@/components/ui/button"
+import { useCart } from "@/contexts/cart-context"
+import { drawRoute, fetchLayout, fetchRoute } from "@/lib/store-map"
+import { useEffect, useState } from "react"
 
 export default function PathPage() {
+  const { items } = useCart()
+  const [collectedCount, setCollectedCount] = useState(0)
+  const [pathSvg, setPathSvg] = useState<string | null>(null)
+  const [collectItem, setCollectItem] = useState<string | null>(null)
+  const [error, setError] = useState<string | null>(null)
+
+  useEffect(() => {
+    if (items.length === 0) return
+
+    let cancelled = false
+    const loadRoute = async () => {
+      try {
+        const route = await fetchRoute(
+          items.map((item) => ({ id: item.id, name: item.name, quantity: item.quantity })),
+          collectedCount,
+        )
+        const layout = await fetchLayout(route.layout)
+        if (!cancelled) {
+          setPathSvg(drawRoute(layout, route.route, route.current))
+          setCollectItem(route.collectItem)
+          setError(null)
+        }
+      } catch (err) {
+        if (!cancelled) {
+          setError("Failed to generate optimal path. Please try again.")
+        }
+        console.error("Error generating path:", err)
+      }
+    }
+    loadRoute()
+    return () => {
+      cancelled = true
+    }
+  }, [items, collectedCount])
+
+  if (items.length === 0) {
+    return (
+      <div className="container mx-auto px-4 py-12">
+        <div className="text-center">
+          <h1 className="text-3xl font-bold text-gray-900 mb-4">Your Cart is Empty</h1>
+          <p className="text-gray-600 mb-8">Add some products to see your shopping path!</p>
+          <Link href="/">
+            <Button className="bg-blue-500 hover:bg-blue-600 text-white">Continue Shopping</Button>
+          </Link>
+        </div>
+      </div>
+    )
+  }
+
   return (
-    <div className="min-h-screen bg-gray-100">
-      {/* Full screen path image */}
-      <div className="relative w-full h-screen">
-        <Image src="/images/store-path.jpg" alt="Store Navigation Path" fill className="object-cover" priority />
-
-        {/* Optional overlay with instructions */}
-        <div className="absolute inset-0 bg-black bg-opacity-30 flex items-center justify-center">
-          <div className="text-center text-white p-8 bg-black bg-opacity-50 rounded-lg">
-            <h1 className="text-4xl font-bold mb-4">Your Shopping Path</h1>
-            <p className="text-xl mb-6">Follow the highlighted path to collect your items efficiently</p>
-            <div className="text-lg">
-              <p className="mb-2">🛒 Start at the entrance</p>
-              <p className="mb-2">📍 Follow the blue path markers</p>
-              <p className="mb-2">✅ Collect items in order</p>
-              <p>🏁 End at checkout</p>
-            </div>
-          </div>
+    <div className="container mx-auto px-4 py-8">
+      <h1 className="text-3xl font-bold text-gray-900 mb-8 flex items-center">
+        <MapPin className="h-7 w-7 mr-2 text-blue-500" />
+        Your Shopping Path
+      </h1>
+
+      {collectItem && (
+        <p className="text-lg mb-4">
+          Next: <span className="font-semibold">{collectItem}</span>
+        </p>
+      )}
+
+      {pathSvg && (
+        <div className="border border-gray-200 rounded-lg p-4 bg-gray-50">
+          <div
+            className="w-full max-w-[800px] mx-auto [&>svg]:w-full [&>svg]:h-auto"
+            dangerouslySetInnerHTML={{ __html: pathSvg }}
+          />
         </div>
+      )}
+
+      {error && (
+        <div className="mt-4 p-4 bg-red-50 border border-red-200 rounded-lg">
+          <p className="text-red-600">{error}</p>
+        </div>
+      )}
+
+      <div className="mt-6 flex justify-center space-x-4">
+        <Button
+          variant="outline"
+          onClick={() => setCollectedCount((count) => Math.max(0, count - 1))}
+          disabled={collectedCount === 0}
+        >
+          Previous Item
+        </Button>
+        <Button
+          className="bg-blue-500 hover:bg-blue-600 text-white"
+          onClick={() => setCollectedCount((count) => count + 1)}
+          disabled={collectedCount >= items.length}
+        >
+          Next Item
+        </Button>
       </div>
     </div>
   )
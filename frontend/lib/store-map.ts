@@ -0,0 +1,104 @@
+const API_URL = "http://localhost:8000/api"
+
+export interface StoreLayout {
+  version: string
+  width: number
+  height: number
+  squareSize: number
+  lineWidth: number
+  offset: number
+  svg: string
+}
+
+export interface Route {
+  layout: string
+  route: number[]
+  current: number
+  collectItem: string
+  // Whether the tour is proven shortest, else how far above it may be
+  optimal: boolean | null
+  gap: number | null
+}
+
+let cachedLayout: StoreLayout | null = null
+
+// The map only changes when the backend layout does, so it is fetched once
+// and revalidated with its ETag when a route names a different version.
+export async function fetchLayout(version?: string): Promise<StoreLayout> {
+  if (cachedLayout && (!version || cachedLayout.version === version)) {
+    return cachedLayout
+  }
+  const response = await fetch(`${API_URL}/layout/`, { credentials: "include" })
+  if (!response.ok) {
+    throw new Error("Failed to load store layout")
+  }
+  cachedLayout = await response.json()
+  return cachedLayout!
+}
+
+export async function fetchRoute(
+  items: { id: string; name: string; quantity: number }[],
+  collectedCount: number,
+): Promise<Route> {
+  const response = await fetch(`${API_URL}/generate-path/`, {
+    method: "POST",
+    credentials: "include",
+    headers: {
+      "Content-Type": "application/json",
+    },
+    body: JSON.stringify({ items, collectedCount, format: "binary" }),
+  })
+  if (!response.ok) {
+    throw new Error("Failed to generate path")
+  }
+  const [current, ...route] = decodeRoute(new Uint8Array(await response.arrayBuffer()))
+  return {
+    layout: response.headers.get("X-Layout-Version") ?? "",
+    route,
+    current,
+    // Percent-encoded, as header values cannot hold any item name
+    collectItem: decodeURIComponent(response.headers.get("X-Collect-Item") ?? ""),
+    optimal: JSON.parse(response.headers.get("X-Route-Optimal") ?? "null"),
+    gap: JSON.parse(response.headers.get("X-Route-Gap") ?? "null"),
+  }
+}
+
+// Varints of the current square and the zigzag-encoded steps of the route
+export function decodeRoute(body: Uint8Array): number[] {
+  const values: number[] = []
+  let value = 0
+  let shift = 0
+  for (const byte of body) {
+    value += (byte & 0x7f) * 2 ** shift
+    shift += 7
+    if (!(byte & 0x80)) {
+      values.push(value)
+      value = shift = 0
+    }
+  }
+  const [current, ...steps] = values
+  let previous = 0
+  return [current, ...steps.map((step) => (previous += step & 1 ? -(step + 1) / 2 : step / 2))]
+}
+
+// Same markers and route polyline the backend renderer draws over the map
+export function drawRoute(layout: StoreLayout, route: number[], current: number): string {
+  const { width, squareSize, lineWidth, offset } = layout
+  const half = squareSize / 2
+  const topLeft = (index: number) => [
+    (index % width) * squareSize + offset,
+    Math.floor(index / width) * squareSize + offset,
+  ]
+  const label = (emoji: string, [x, y]: number[]) =>
+    `<text x="${x + half}" y="${y + half}" font-size="${half}px" text-anchor="middle" dominant-baseline="middle">${emoji}</text>`
+
+  const points = route.map((index) => topLeft(index).map((value) => value + half).join(",")).join(" ")
+  const [x, y] = topLeft(current)
+  const overlay = [
+    label("\u{1F6B6}", topLeft(route[0])),
+    label("⭐", [x, y]),
+    `<text x="${x + half}" y="${y + half + 8}" fill="green" font-size="${squareSize}px" text-anchor="middle" dominant-baseline="middle">\u{1F7E9}</text>`,
+    `<polyline points="${points}" stroke-width="${lineWidth * 2}" stroke-opacity="50%" stroke="red" fill="none" marker-end="url(#arrow)"/>`,
+  ].join("")
+  return layout.svg.replace("</svg>", `${overlay}</svg>`)
+}